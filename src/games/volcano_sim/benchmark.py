@@ -0,0 +1,201 @@
+''' benchmarks the hot paths of the volcano simulation.
+    run: python -m games.volcano_sim.benchmark --output results.json
+    compare with an earlier run: ... --compare old_results.json
+'''
+
+import argparse
+import json
+import math
+import platform
+import time
+import numpy as np
+import pygame
+from games.volcano_sim.settings import Settings
+from games.volcano_sim.particle import Particle
+from games.volcano_sim.volcano import Volcano
+from games.volcano_sim.eruption_scheduler import PeriodicEruption
+from games.volcano_sim.planet import Planet
+from games.volcano_sim.headless import HeadlessGame
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_REPEATS = 5
+SEED = 0
+
+# ==========================================================================
+#                         BENCHMARK CASES
+# ==========================================================================
+
+class Bench:
+    ''' a headless volcano (with an off-screen planet) to run the cases on'''
+    def __init__(self, particles: int):
+        ''' build the objects for a benchmark with the number of particles'''
+        self.settings = Settings()
+        self.particles = particles
+        self.volcano = Volcano(
+            self.settings, Particle(self.settings),
+            [PeriodicEruption(duration=1, downtime=0)]  # erupt every tick
+        )
+        self.planet = Planet(self.volcano, self.settings, None)
+        self.game = HeadlessGame(self.volcano, self.planet)
+        self._rng = np.random.default_rng(SEED)
+
+
+    def populate(self, out_of_bounds: float = 0):
+        ''' fill the store with particles spread over the window.
+            out_of_bounds: share of the particles placed below the screen
+        '''
+        self.volcano.concurrent_expulsions = \
+            self.settings.concurrent_expulsions
+        store = self.volcano.store
+        store.clear()
+        x = self._rng.random(self.particles)
+        y = self._rng.random(self.particles)
+        y[:int(self.particles * out_of_bounds)] = -.1
+        velocity = self.settings.default_velocity
+        store.spawn(
+            x, y,
+            self._rng.normal(0, velocity, self.particles),
+            self._rng.normal(velocity, velocity, self.particles)
+        )
+        self.volcano.update_pixel_centers()
+
+
+    def setup_erupt(self):
+        ''' an empty store, one expulsion creates all particles'''
+        self.volcano.store.clear()
+        self.volcano.concurrent_expulsions = self.particles
+        self.volcano.scheduler.skip_to(self.volcano.tick)  # erupt now
+
+
+    def setup_culling(self):
+        ''' half of the particles are out of bounds'''
+        self.populate(out_of_bounds=.5)
+
+
+    def blit_volcano(self):
+        ''' draw all particles, then restore the background'''
+        self.planet.blit_volcano()
+        self.planet.refresh_background()
+
+
+def cases(bench: Bench) -> dict:
+    ''' returns the benchmark cases as name: (setup, function)'''
+    return {
+        'erupt': (bench.setup_erupt, bench.volcano.erupt),
+        'update_velocities': (
+            bench.populate, bench.volcano.update_particle_velocities
+        ),
+        'update_positions': (
+            bench.populate, bench.volcano.update_particle_positions
+        ),
+        'step': (bench.populate, bench.volcano.step),
+        'destroy_out_of_bounds': (
+            bench.setup_culling, bench.volcano.destroy_out_of_bounds
+        ),
+        'blit_volcano': (bench.populate, bench.blit_volcano),
+        'headless_frame': (bench.populate, lambda: bench.game.tick(True)),
+    }
+
+# ==========================================================================
+#                         RUNNER
+# ==========================================================================
+
+def time_case(setup, function, repeats: int) -> float:
+    ''' returns the fastest of repeats runs in seconds (setup not timed)'''
+    best = math.inf
+    for _ in range(repeats):
+        setup()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(
+    sizes=DEFAULT_SIZES, repeats: int = DEFAULT_REPEATS, names=None
+) -> list[dict]:
+    ''' runs the (selected) cases for all sizes'''
+    results = []
+    for size in sizes:
+        bench = Bench(size)
+        for name, (setup, function) in cases(bench).items():
+            if names and name not in names:
+                continue
+            seconds = time_case(setup, function, repeats)
+            results.append({
+                'benchmark': name,
+                'particles': size,
+                'seconds': seconds,
+                'particles_per_second': size / seconds if seconds else None,
+            })
+    return results
+
+
+def environment() -> dict:
+    ''' returns the versions the results were measured with'''
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+    }
+
+
+def compare(results: list[dict], old_results: list[dict]) -> list[str]:
+    ''' returns one line per case with the speedup against old_results'''
+    old = {
+        (result['benchmark'], result['particles']): result['seconds']
+        for result in old_results
+    }
+    lines = []
+    for result in results:
+        key = (result['benchmark'], result['particles'])
+        if key in old and result['seconds']:
+            lines.append(
+                f'{key[0]:>22} {key[1]:>8}: '
+                f'{old[key] / result["seconds"]:6.2f}x'
+            )
+    return lines
+
+# ======================================================================
+#                           DRIVER CODE:
+# ======================================================================
+
+def main():
+    ''' driver code'''
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES)
+    )
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--only', nargs='+', help='names of the cases')
+    parser.add_argument('--label', default='', help='e.g. the commit')
+    parser.add_argument('--output', help='write the results to this file')
+    parser.add_argument('--compare', help='results file of an earlier run')
+    arguments = parser.parse_args()
+
+    results = run_benchmarks(
+        arguments.sizes, arguments.repeats, arguments.only
+    )
+    for result in results:
+        print(
+            f'{result["benchmark"]:>22} {result["particles"]:>8}: '
+            f'{result["seconds"] * 1000:10.3f} ms'
+        )
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='utf-8') as file:
+            json.dump({
+                'label': arguments.label,
+                'environment': environment(),
+                'results': results,
+            }, file, indent=2)
+    if arguments.compare:
+        with open(arguments.compare, encoding='utf-8') as file:
+            old_results = json.load(file)['results']
+        print('speedup against', arguments.compare)
+        for line in compare(results, old_results):
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
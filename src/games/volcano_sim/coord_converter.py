@@ -1,4 +1,5 @@
 ''' coordinate conversion class'''
+import numpy as np
 from games.volcano_sim.settings import Settings
 
 class CoordConverter:
@@ -11,6 +12,20 @@ class CoordConverter:
             self.window_size = (0, 0)
 
 
+    @property
+    def window_size(self) -> tuple[int, int]:
+        ''' returns the window size in pixels'''
+        return self._window_size
+
+
+    @window_size.setter
+    def window_size(self, new_size: tuple[int, int]):
+        ''' sets the window size and the scale factors for the arrays'''
+        self._window_size = new_size
+        self._x_scale = float(new_size[0])
+        self._y_scale = float(new_size[1])
+
+
     def convert_x_to_px(self, internal_coord: float) -> int:
         ''' calculate a pixel x coordinate based on internal coordinates'''
         x_max = self.window_size[0]
@@ -49,6 +64,63 @@ class CoordConverter:
         return (x, y)
 
 
+    def convert_x_array_to_px(
+        self, internal_coords: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        ''' calculate pixel x coordinates for a whole array at once.
+            out: integer array to write the result into
+        '''
+        return self._rint(internal_coords * self._x_scale, out)
+
+
+    def convert_y_array_to_px(
+        self, internal_coords: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        ''' calculate pixel y coordinates for a whole array at once'''
+        # internal coords count bottom-up, pygame counts top-down:
+        return self._rint((1 - internal_coords) * self._y_scale, out)
+
+
+    def convert_internal_arrays_to_px(
+        self, x_coords: np.ndarray, y_coords: np.ndarray,
+        out: tuple[np.ndarray, np.ndarray] | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        ''' calculate the pixel coordinates of N points (x and y arrays)'''
+        self._validate_arrays(x_coords, y_coords)
+        x_out, y_out = (None, None) if out is None else out
+        return (
+            self.convert_x_array_to_px(x_coords, x_out),
+            self.convert_y_array_to_px(y_coords, y_out)
+        )
+
+
+    def convert_dimension_arrays_to_px(
+        self, widths: np.ndarray, heights: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        ''' convert N dimensions (width and height arrays) to pixels'''
+        self._validate_arrays(widths, heights)
+        return (
+            self._rint(widths * self._x_scale),
+            self._rint(heights * self._y_scale)
+        )
+
+
+    def _rint(
+        self, values: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        ''' rounds like round() (half to even) into an integer array'''
+        if out is None:
+            return np.rint(values).astype(np.int64)
+        return np.rint(values, out=out, casting='unsafe')
+
+
+    def _validate_arrays(self, x_coords, y_coords) -> None:
+        ''' raises error when the coordinate arrays don't match'''
+        if np.shape(x_coords) != np.shape(y_coords):
+            print('ERROR: the coordinate arrays must have the same shape!')
+            raise ValueError
+
+
     def _validate_coords(self, coords) -> None:
         ''' raises error when the coordinate type/dimensions don't fit'''
         try:
@@ -0,0 +1,197 @@
+''' includes the eruption profiles and the EruptionScheduler.
+    Profiles know in advance at which ticks they expel particles, so the
+    scheduler only has to look at the earliest of them every tick
+'''
+from abc import ABC
+from abc import abstractmethod
+import heapq
+import numpy as np
+
+
+class EruptionProfile(ABC):
+    ''' abstract base class for the timing of the expulsions'''
+    @abstractmethod
+    def next_emission(self, tick: int) -> tuple[int, int] | None:
+        ''' returns (tick, expulsions) of the first emission at or after
+            tick, None if there is none
+        '''
+
+    @abstractmethod
+    def next_start(self, tick: int) -> int | None:
+        ''' returns the first tick at or after tick an eruption starts'''
+
+
+class PeriodicEruption(EruptionProfile):
+    ''' erupts for duration ticks, expelling every interval ticks, then
+        rests for downtime ticks, starting at tick start.
+        Bursts are short eruptions with many expulsions
+    '''
+    def __init__(
+        self, duration: int, downtime: int, expulsions: int = 1,
+        interval: int = 1, start: int = 0
+    ):
+        ''' all times in ticks'''
+        if duration <= 0 or interval <= 0 or downtime < 0 or expulsions < 0:
+            print('ERROR: duration/interval must be positive, '
+                  'downtime/expulsions not negative!')
+            raise ValueError
+        self._duration = duration
+        self._downtime = downtime
+        self._expulsions = expulsions
+        self._interval = interval
+        self._start = start
+
+
+    def next_emission(self, tick: int) -> tuple[int, int]:
+        ''' returns the next tick on the interval grid of an eruption'''
+        cycle_start, phase = self._cycle_position(tick)
+        if phase < self._duration:
+            offset = -(-phase // self._interval) * self._interval
+            if offset < self._duration:
+                return cycle_start + offset, self._expulsions_at(offset)
+        cycle_start += self._duration + self._downtime
+        return cycle_start, self._expulsions_at(0)
+
+
+    def next_start(self, tick: int) -> int:
+        ''' returns the start of the next cycle (or tick if it starts one)'''
+        cycle_start, phase = self._cycle_position(tick)
+        if phase == 0:
+            return cycle_start
+        return cycle_start + self._duration + self._downtime
+
+
+    def _cycle_position(self, tick: int) -> tuple[int, int]:
+        ''' returns the start of the cycle tick lies in and its phase'''
+        tick = max(tick, self._start)
+        phase = (tick - self._start) % (self._duration + self._downtime)
+        return tick - phase, phase
+
+
+    def _expulsions_at(self, offset: int) -> int:
+        ''' returns the expulsions offset ticks into an eruption'''
+        return self._expulsions
+
+
+class DecayingEruption(PeriodicEruption):
+    ''' periodic eruption whose expulsions fall off exponentially:
+        expulsions * decay ** (ticks since the eruption started)
+    '''
+    def __init__(
+        self, duration: int, downtime: int, expulsions: int = 1,
+        interval: int = 1, start: int = 0, decay: float = .9
+    ):
+        ''' decay: factor per tick, between 0 and 1'''
+        super().__init__(duration, downtime, expulsions, interval, start)
+        if not 0 < decay <= 1:
+            print('ERROR: decay must be in (0, 1]!')
+            raise ValueError
+        self._decay = decay
+
+
+    def _expulsions_at(self, offset: int) -> int:
+        ''' returns the decayed expulsions offset ticks into an eruption'''
+        return round(self._expulsions * self._decay ** offset)
+
+
+class PoissonEruption(EruptionProfile):
+    ''' expels at random ticks, with the given probability per tick
+        (a Poisson process in discrete time)
+    '''
+    def __init__(
+        self, rate: float, expulsions: int = 1,
+        rng: np.random.Generator | None = None
+    ):
+        ''' rate: probability of an emission per tick, between 0 and 1'''
+        if not 0 < rate <= 1:
+            print('ERROR: rate must be in (0, 1]!')
+            raise ValueError
+        self._rate = rate
+        self._expulsions = expulsions
+        self._rng = rng if rng is not None else np.random.default_rng()
+        self._pending = None  # drawn, but not yet passed emission tick
+
+
+    def next_emission(self, tick: int) -> tuple[int, int]:
+        ''' returns the next random emission at or after tick'''
+        if self._pending is None or self._pending < tick:
+            # number of ticks up to and including the next emission:
+            self._pending = tick + int(self._rng.geometric(self._rate)) - 1
+        return self._pending, self._expulsions
+
+
+    def next_start(self, tick: int) -> int:
+        ''' every emission is an eruption of its own'''
+        return self.next_emission(tick)[0]
+
+
+class EruptionScheduler:
+    ''' keeps the next emission of every profile in a priority queue.
+        While nothing is due, checking a tick costs O(1)
+    '''
+    def __init__(self, profiles: list[EruptionProfile], tick: int = 0):
+        ''' queue the first emissions at or after tick'''
+        self._profiles = list(profiles)
+        self._queue = []  # heap of (tick, profile index, expulsions)
+        self.skip_to(tick)
+
+
+    @property
+    def profiles(self) -> list[EruptionProfile]:
+        ''' returns the scheduled profiles'''
+        return self._profiles
+
+
+    @property
+    def next_tick(self) -> int | None:
+        ''' returns the tick of the next emission (None: no emissions)'''
+        return self._queue[0][0] if self._queue else None
+
+
+    def add(self, profile: EruptionProfile, tick: int = 0) -> None:
+        ''' schedules another profile, from tick on'''
+        self._profiles.append(profile)
+        self._push(len(self._profiles) - 1, tick)
+
+
+    def due(self, tick: int) -> int:
+        ''' returns the sum of all expulsions due up to tick and queues
+            the following emissions
+        '''
+        return sum(number for _, number in self.pop_due(tick))
+
+
+    def pop_due(self, tick: int) -> list[tuple[int, int]]:
+        ''' returns (profile index, expulsions) of every emission due up
+            to tick and queues the following emissions
+        '''
+        emissions = []
+        while self._queue and self._queue[0][0] <= tick:
+            emission_tick, index, number = heapq.heappop(self._queue)
+            emissions.append((index, number))
+            self._push(index, emission_tick + 1)
+        return emissions
+
+
+    def next_start(self, tick: int) -> int | None:
+        ''' returns the first tick at or after tick an eruption starts'''
+        starts = [
+            start for start in (
+                profile.next_start(tick) for profile in self._profiles
+            ) if start is not None
+        ]
+        return min(starts) if starts else None
+
+
+    def skip_to(self, tick: int) -> None:
+        ''' drops all emissions before tick without expelling them'''
+        self._queue = []
+        for index in range(len(self._profiles)):
+            self._push(index, tick)
+
+
+    def _push(self, index: int, tick: int) -> None:
+        ''' queues the next emission of a profile at or after tick'''
+        emission = self._profiles[index].next_emission(tick)
+        if emission is not None:
+            heapq.heappush(self._queue, (emission[0], index, emission[1]))
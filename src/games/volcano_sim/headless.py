@@ -0,0 +1,108 @@
+''' run the volcano simulation without a window (batch jobs, CI)'''
+
+import argparse
+import pygame
+from games.volcano_sim.settings import Settings
+from games.volcano_sim.planet import Planet, Map, Eruptor
+from games.volcano_sim.particle import Particle
+from games.volcano_sim.volcano import (
+    Volcano, AnalyticVolcano, VolcanicField
+)
+
+# ==========================================================================
+#                         HEADLESS ENGINE
+# ==========================================================================
+
+class HeadlessGame:
+    ''' drives the simulation without display, event pump or fonts.
+        With a game_map, every tick can also be rendered off-screen
+    '''
+    def __init__(self, eruptor: Eruptor, game_map: Map | None = None):
+        ''' construct the engine around an eruptor (and optional map)'''
+        self._eruptor = eruptor
+        self._game_map = game_map
+        self._ticks = 0
+        if game_map is not None:
+            self._frame = pygame.Surface(game_map.background.get_size())
+        else:
+            self._frame = None
+
+
+    @property
+    def eruptor(self):
+        ''' returns the object managing the flying particles'''
+        return self._eruptor
+
+
+    @property
+    def ticks(self) -> int:
+        ''' returns the number of simulated ticks'''
+        return self._ticks
+
+
+    @property
+    def frame(self) -> pygame.Surface | None:
+        ''' returns the last rendered frame (None without game_map)'''
+        return self._frame
+
+
+    def tick(self, render: bool = False):
+        ''' simulate one tick, the same way Game.main_loop does'''
+        if render:
+            self.render()
+        self.eruptor.destroy_out_of_bounds()
+        self.eruptor.erupt()
+        self.eruptor.step()
+        self._ticks += 1
+
+
+    def run(self, ticks: int, render: bool = False):
+        ''' simulate a number of ticks, optionally rendering each one'''
+        for _ in range(ticks):
+            self.tick(render)
+
+
+    def render(self) -> pygame.Surface:
+        ''' draws the current particles into the off-screen frame'''
+        if self._game_map is None:
+            print('ERROR: rendering needs a game_map!')
+            raise ValueError
+        self._game_map.blit_volcano()
+        self._frame.blit(self._game_map.background, (0, 0))
+        self._game_map.refresh_background()
+        return self._frame
+
+
+def build_headless(settings: Settings, render: bool = False) -> HeadlessGame:
+    ''' build the engine from settings, with a Planet if rendering'''
+    if settings.vent_positions is not None:
+        volcano = VolcanicField.from_positions(
+            settings, settings.vent_positions
+        )
+    elif settings.analytic_trajectories:
+        volcano = AnalyticVolcano(settings, Particle(settings))
+    else:
+        volcano = Volcano(settings, Particle(settings))
+    if render:
+        return HeadlessGame(volcano, Planet(volcano, settings, None))
+    return HeadlessGame(volcano)
+
+# ======================================================================
+#                           DRIVER CODE:
+# ======================================================================
+
+def main():
+    ''' driver code'''
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--ticks', type=int, default=1_000)
+    parser.add_argument('--render', action='store_true')
+    arguments = parser.parse_args()
+    game = build_headless(Settings(), arguments.render)
+    game.run(arguments.ticks, arguments.render)
+    print(
+        f'{game.ticks} ticks, {len(game.eruptor.store)} live particles'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+''' includes the HeatmapAccumulator class'''
+import numpy as np
+import pygame
+
+DEFAULT_RESOLUTION = (128, 78)  # density bins in x and y
+DEFAULT_LANDING_BINS = 128
+
+
+class HeatmapAccumulator:
+    ''' collects where the particles fly and land, incrementally and in
+        bulk: the density is a 2D histogram of all particle positions
+        over all ticks, the landings are the x coordinates particles hit
+        the ground at. Both cover the window (internal coords 0 to 1)
+    '''
+    def __init__(
+        self, resolution: tuple[int, int] | None = DEFAULT_RESOLUTION,
+        landing_bins: int = DEFAULT_LANDING_BINS
+    ):
+        ''' resolution: number of density bins in x and y (None: only
+            collect the landings, the density isn't calculated)
+        '''
+        if landing_bins <= 0 or (resolution is not None
+                                 and min(resolution) <= 0):
+            print('ERROR: resolution and landing_bins must be positive!')
+            raise ValueError
+        if resolution is None:
+            self._resolution = None
+            self._density = None
+        else:
+            self._resolution = tuple(resolution)
+            # indexed [x bin, y bin] with y pointing down, like surfarray:
+            self._density = np.zeros(self._resolution, dtype=np.int64)
+        self._landing_histogram = np.zeros(landing_bins, dtype=np.int64)
+        self._landings = []  # arrays of landing x, joined when read
+        self._samples = 0
+
+
+    @property
+    def resolution(self) -> tuple[int, int] | None:
+        ''' returns the number of density bins in x and y (None: landings
+            only)
+        '''
+        return self._resolution
+
+
+    @property
+    def density(self) -> np.ndarray | None:
+        ''' returns the particle counts per bin, indexed [x, y] with y
+            pointing down (like pixels). None: landings only
+        '''
+        return self._density
+
+
+    @property
+    def samples(self) -> int:
+        ''' returns the number of accumulated ticks'''
+        return self._samples
+
+
+    @property
+    def landing_x(self) -> np.ndarray:
+        ''' returns the x coordinates of all landings, in order'''
+        if len(self._landings) > 1:
+            self._landings = [np.concatenate(self._landings)]
+        return self._landings[0] if self._landings else np.empty(0)
+
+
+    @property
+    def landing_histogram(self) -> np.ndarray:
+        ''' returns the landings per bin of x across the window'''
+        return self._landing_histogram
+
+
+    def accumulate(self, x: np.ndarray, y: np.ndarray):
+        ''' adds the positions of one tick to the density'''
+        self._samples += 1
+        if self._density is None:
+            return
+        width, height = self._resolution
+        inside = (x >= 0) & (x <= 1) & (y >= 0) & (y <= 1)
+        x_bin = np.minimum(x[inside] * width, width - 1).astype(np.intp)
+        y_bin = np.minimum(
+            (1 - y[inside]) * height, height - 1
+        ).astype(np.intp)
+        flat = x_bin * height + y_bin
+        self._density += np.bincount(
+            flat, minlength=width * height
+        ).reshape(width, height)
+
+
+    def record_landings(self, x: np.ndarray):
+        ''' adds particles that hit the ground at x'''
+        if len(x) == 0:
+            return
+        x = np.array(x, dtype=np.float64)
+        self._landings.append(x)
+        bins = len(self._landing_histogram)
+        self._landing_histogram += np.bincount(
+            np.clip(np.floor(x * bins).astype(np.intp), 0, bins - 1),
+            minlength=bins
+        )
+
+
+    def clear(self):
+        ''' forgets everything accumulated so far'''
+        if self._density is not None:
+            self._density[:] = 0
+        self._landing_histogram[:] = 0
+        self._landings = []
+        self._samples = 0
+
+
+    def overlay(
+        self, size: tuple[int, int], alpha: int = 160
+    ) -> pygame.Surface:
+        ''' returns the density as a surface of size, black (empty) over
+            red to yellow (densest), on a logarithmic scale
+        '''
+        if self._density is None:
+            print('ERROR: a landings only heatmap has no overlay!')
+            raise ValueError
+        intensity = np.log1p(self._density)
+        if intensity.max() > 0:
+            intensity /= intensity.max()
+        rgb = np.zeros((*self._resolution, 3), dtype=np.uint8)
+        rgb[..., 0] = np.minimum(intensity * 2, 1) * 255
+        rgb[..., 1] = np.maximum(intensity * 2 - 1, 0) * 255
+        surface = pygame.transform.scale(
+            pygame.surfarray.make_surface(rgb), size
+        )
+        surface.set_colorkey((0, 0, 0))
+        surface.set_alpha(alpha)
+        return surface
@@ -0,0 +1,77 @@
+''' integrators moving whole particle arrays by one (sub)step.
+    All of them update x, y, vx and vy in place. accel is called as
+    accel(x, y, vx, vy) and returns the accelerations (ax, ay) as arrays
+    or scalars. Times are in ticks, dt = 1 is one full tick
+'''
+
+
+def semi_implicit_euler(x, y, vx, vy, accel, dt: float) -> None:
+    ''' first order: updates the velocities, then moves with the new ones.
+        With dt = 1 this is the step the volcano always used
+    '''
+    x_accel, y_accel = accel(x, y, vx, vy)
+    vx += x_accel * dt
+    vy += y_accel * dt
+    x += vx * dt
+    y += vy * dt
+
+
+def velocity_verlet(x, y, vx, vy, accel, dt: float) -> None:
+    ''' second order, exact for constant accelerations'''
+    x_accel, y_accel = accel(x, y, vx, vy)
+    x += vx * dt + .5 * x_accel * dt ** 2
+    y += vy * dt + .5 * y_accel * dt ** 2
+    # velocities at the end of the step, for velocity dependent forces:
+    new_x_accel, new_y_accel = accel(
+        x, y, vx + x_accel * dt, vy + y_accel * dt
+    )
+    vx += .5 * (x_accel + new_x_accel) * dt
+    vy += .5 * (y_accel + new_y_accel) * dt
+
+
+def runge_kutta_4(x, y, vx, vy, accel, dt: float) -> None:
+    ''' classic fourth order Runge-Kutta on positions and velocities'''
+    x_0, y_0, vx_0, vy_0 = x.copy(), y.copy(), vx.copy(), vy.copy()
+    # each k holds the derivatives (dx, dy, dvx, dvy) at a sample point
+    k_1 = (vx_0, vy_0, *accel(x_0, y_0, vx_0, vy_0))
+    k_2 = _rk4_sample(x_0, y_0, vx_0, vy_0, k_1, dt / 2, accel)
+    k_3 = _rk4_sample(x_0, y_0, vx_0, vy_0, k_2, dt / 2, accel)
+    k_4 = _rk4_sample(x_0, y_0, vx_0, vy_0, k_3, dt, accel)
+    for array, start, index in ((x, x_0, 0), (y, y_0, 1),
+                                (vx, vx_0, 2), (vy, vy_0, 3)):
+        array[:] = start + dt / 6 * (
+            k_1[index] + 2 * k_2[index] + 2 * k_3[index] + k_4[index]
+        )
+
+
+def _rk4_sample(x, y, vx, vy, k, dt: float, accel) -> tuple:
+    ''' returns the derivatives at the state moved dt along k'''
+    sample_vx = vx + k[2] * dt
+    sample_vy = vy + k[3] * dt
+    return (
+        sample_vx, sample_vy,
+        *accel(x + k[0] * dt, y + k[1] * dt, sample_vx, sample_vy)
+    )
+
+
+INTEGRATORS = {
+    'euler': semi_implicit_euler,
+    'verlet': velocity_verlet,
+    'rk4': runge_kutta_4,
+}
+
+
+def get_integrator(name: str):
+    ''' returns the integrator function for a name in INTEGRATORS'''
+    if name not in INTEGRATORS:
+        print(f'ERROR: integrator must be one of {", ".join(INTEGRATORS)}!')
+        raise ValueError
+    return INTEGRATORS[name]
+
+
+def integrate(x, y, vx, vy, accel, integrator, substeps: int = 1) -> None:
+    ''' advances the arrays by one tick in substeps equal substeps'''
+    dt = 1 / substeps
+    for _ in range(substeps):
+        integrator(x, y, vx, vy, accel, dt)
+
@@ -6,7 +6,12 @@ from games.volcano_sim.coord_converter import CoordConverter
 from games.volcano_sim.pyclock import PyClock
 from games.volcano_sim.planet import Planet, Map
 from games.volcano_sim.particle import Particle
-from games.volcano_sim.volcano import Volcano
+from games.volcano_sim.volcano import (
+    Volcano, AnalyticVolcano, VolcanicField
+)
+from games.volcano_sim.profiler import FrameProfiler
+from games.volcano_sim.recording import Recorder
+from games.volcano_sim.heatmap import HeatmapAccumulator
 
 # ==========================================================================
 #                         HIGHEST-LEVEL CLASS
@@ -24,25 +29,51 @@ class Game(CoordConverter):
         self.screen = pygame.display.set_mode(self.window_size)
         self.clock = clock
         self.game_map = game_map
+        self._dirty_rects = settings.dirty_rects
+        self._max_dirty_rects = settings.max_dirty_rects
+        self._previous_rects = None  # None: the whole screen is outdated
+        self.profiler = FrameProfiler(
+            settings.profile_window, settings.profile_phases
+        )
+        self._profile_overlay = settings.profile_overlay
+        self._cprofile_frames = settings.cprofile_frames
+        self._cprofile_path = settings.cprofile_path
+        self._heatmap_overlay = settings.heatmap_overlay
+        self._heatmap_refresh_ticks = settings.heatmap_refresh_ticks
+        self._heatmap_image = None
+        self._heatmap_samples = 0  # samples the image was drawn from
 
 
     def main_loop(self,):
-        ''' define the main loop fo the program'''  
-        self.clock.clock.tick(1)  # TODO: set FPS to 60
+        ''' define the main loop fo the program. Rendering is capped at
+            fps_cap, physics runs at a fixed physics_hz independent of it
+        '''
+        profiler = self.profiler
+        eruptor = self.game_map.eruptor
         running = True
         while running:
-            if self.check_player_quits():
-                running = False
-            self.game_map.blit_volcano()
-            self.screen.blit(self.game_map.background, (0,0))
-            self.game_map.blit_planet()
-            self.blit_screen()
-            pygame.display.flip()
-
-            self.game_map.eruptor.destroy_out_of_bounds()
-            self.game_map.eruptor.erupt()
-            self.game_map.eruptor.update_particle_velocities()
-            self.game_map.eruptor.update_particle_positions()
+            with profiler.phase('events'):
+                if self.check_player_quits():
+                    running = False
+            if self._dirty_rects:
+                self.update_dirty_rects()
+            else:
+                with profiler.phase('blit_volcano'):
+                    self.game_map.blit_volcano()
+                with profiler.phase('blit_screen'):
+                    self.blit_screen()
+                    self.blit_overlay()
+                with profiler.phase('flip'):
+                    pygame.display.flip()
+
+            for _ in range(self.clock.tick()):
+                with profiler.phase('destroy_out_of_bounds'):
+                    eruptor.destroy_out_of_bounds()
+                with profiler.phase('erupt'):
+                    eruptor.erupt()
+                with profiler.phase('step'):
+                    eruptor.step()
+            profiler.end_frame(len(eruptor.store))
         pygame.quit()
 
 
@@ -51,17 +82,88 @@ class Game(CoordConverter):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return True
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_n:
+                self.game_map.eruptor.skip_to_next_eruption()
         current_keys = pygame.key.get_pressed()
         if current_keys[pygame.K_x]:  # if x is pressed
             return True
+        if current_keys[pygame.K_p] and self._cprofile_frames:
+            self.profiler.profile_frames(
+                self._cprofile_frames, self._cprofile_path
+            )
         return False
 
 
     def blit_screen(self):
-        ''' pblits the default background'''
+        ''' blits the finished background onto the screen, then restores
+            the default background for the next frame
+        '''
         self.screen.blit(self.game_map.background, dest=(0,0))
         self.game_map.refresh_background()
 
+
+    def update_dirty_rects(self):
+        ''' only redraws and pushes the areas that changed since the last
+            frame: where the particles were and where they are now.
+            Falls back to a full update when too many areas changed
+        '''
+        with self.profiler.phase('blit_volcano'):
+            current_rects = self.game_map.particle_rects()
+            self.game_map.blit_volcano()
+        if (self._previous_rects is None
+            or len(self._previous_rects) + len(current_rects)
+                > self._max_dirty_rects):
+            with self.profiler.phase('blit_screen'):
+                self.screen.blit(self.game_map.background, dest=(0,0))
+                overlay_rects = self.blit_overlay()
+            with self.profiler.phase('flip'):
+                pygame.display.flip()
+        else:
+            with self.profiler.phase('blit_screen'):
+                dirty_rects = self._previous_rects + current_rects
+                self.screen.blits(
+                    (
+                        (self.game_map.background, rect, rect)
+                        for rect in dirty_rects
+                    ),
+                    doreturn=False
+                )
+                overlay_rects = self.blit_overlay()
+            with self.profiler.phase('flip'):
+                pygame.display.update(dirty_rects + overlay_rects)
+        self.game_map.refresh_background(current_rects)
+        # the overlay is only on the screen, it's erased like a particle:
+        self._previous_rects = current_rects + overlay_rects
+
+
+    def blit_overlay(self) -> list[pygame.Rect]:
+        ''' blits the heatmap and the profiler summary onto the screen (if
+            switched on). returns the rects covered by them
+        '''
+        rects = self.blit_heatmap()
+        if not self._profile_overlay:
+            return rects
+        top = 0
+        for line in self.profiler.overlay_lines():
+            image = self.clock.font.render(line, False, (255, 255, 255))
+            rects.append(self.screen.blit(image, (0, top)))
+            top += image.get_height()
+        return rects
+
+
+    def blit_heatmap(self) -> list[pygame.Rect]:
+        ''' blits the particle density onto the screen (if switched on),
+            redrawn every heatmap_refresh_ticks ticks
+        '''
+        heatmap = self.game_map.eruptor.heatmap
+        if not self._heatmap_overlay or heatmap is None:
+            return []
+        if (self._heatmap_image is None or heatmap.samples
+                - self._heatmap_samples >= self._heatmap_refresh_ticks):
+            self._heatmap_image = heatmap.overlay(self.window_size)
+            self._heatmap_samples = heatmap.samples
+        return [self.screen.blit(self._heatmap_image, (0, 0))]
+
 # ======================================================================
 #                           DRIVER CODE:
 # ======================================================================
@@ -71,11 +173,26 @@ def main():
     pygame.font.init()
     settings = Settings()
     default_particle = Particle(settings)
-    volcano = Volcano(settings, default_particle)
+    if settings.vent_positions is not None:
+        volcano = VolcanicField.from_positions(
+            settings, settings.vent_positions
+        )
+    elif settings.analytic_trajectories:
+        volcano = AnalyticVolcano(settings, default_particle)
+    else:
+        volcano = Volcano(settings, default_particle)
+    if settings.heatmap_overlay:
+        volcano.heatmap = HeatmapAccumulator(settings.heatmap_resolution)
+    if settings.record_path is not None:
+        volcano.recorder = Recorder.from_settings(
+            settings.record_path, settings
+        )
     clock = PyClock(settings)
     planet = Planet(volcano, settings, clock)
     game = Game(planet, settings, clock)
     game.main_loop()
+    if volcano.recorder is not None:
+        volcano.recorder.close()
 
 
 if __name__ == '__main__':
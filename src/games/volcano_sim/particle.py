@@ -4,6 +4,8 @@ import math
 import pygame
 from games.volcano_sim.settings import Settings
 from games.volcano_sim.coord_converter import CoordConverter
+from games.volcano_sim.particle_store import ParticleStore
+from games.volcano_sim.sprite_cache import SPRITE_CACHE
 
 
 class Particle(CoordConverter):
@@ -18,10 +20,13 @@ class Particle(CoordConverter):
             random variables: internal coordinates (0 to 1),
             angle_spread: random angle in degrees (0 to 360)
         '''
+        self._sprite_key = None
         if settings is None:
             super().__init__()
+            self._random = random.Random()
         else:
             super().__init__(settings)
+            self._random = random.Random(settings.seed)
             self._dimensions = settings.particle_size
             self._position = settings.starting_position
             self._box = self._get_box()
@@ -50,6 +55,8 @@ class Particle(CoordConverter):
         new_particle._position = particle.position
         new_particle._box = new_particle._get_box()
         new_particle._image = particle.image
+        new_particle._sprite_key = particle._sprite_key
+        new_particle._random = particle._random
         all_none = (abs_velocity, velocity_spread, angle_spread) \
                     == (None, None, None)
         if not all_none:
@@ -102,7 +109,11 @@ class Particle(CoordConverter):
 
     @property
     def image(self):
-        ''' returns the image surface of the object'''
+        ''' returns the image surface of the object (shared via the
+            sprite cache, converted to the display format once possible)
+        '''
+        if self._sprite_key is not None:
+            self._image = SPRITE_CACHE.get(*self._sprite_key)
         return self._image
 
 
@@ -167,9 +178,8 @@ class Particle(CoordConverter):
     def _get_image(self, settings: Settings):
         ''' calculate the image size based on the game state'''
         width, height = self.convert_dimensions_to_px(self.dimensions)
-        image = pygame.Surface((width, height))
-        image.fill(settings.particle_color)
-        return image
+        self._sprite_key = ((width, height), settings.particle_color)
+        return SPRITE_CACHE.get(*self._sprite_key)
 
 
     def _determine_velocity(
@@ -201,7 +211,9 @@ class Particle(CoordConverter):
     ) -> tuple[float, float]:
         ''' determine the velocity vector based on a random factor'''
         v_absolute = self._randomize_velocity(v_absolute, spread_v)
-        angle_rand_adjust = 2 * spread_angle * random.random() - spread_angle
+        angle_rand_adjust = (
+            2 * spread_angle * self._random.random() - spread_angle
+        )
         angle_rad = angle_rand_adjust / 360 * 2 * math.pi
         x = v_absolute  * math.sin(angle_rad)
         y = math.sqrt(v_absolute ** 2 - x ** 2)
@@ -213,7 +225,7 @@ class Particle(CoordConverter):
     ) -> tuple[float, float]:
         ''' determine a random velocity'''
         if spread_v != 0:
-            v_rand_adjust = random.random() * 2 * spread_v - spread_v
+            v_rand_adjust = self._random.random() * 2 * spread_v - spread_v
         else:
             v_rand_adjust = 0
         velocity = v_absolute + v_rand_adjust
@@ -225,3 +237,56 @@ class Particle(CoordConverter):
             raise ValueError
         if not len(value) == 2:
             raise ValueError
+
+
+class ParticleView:
+    ''' a lightweight, read-only view onto one particle of a ParticleStore.
+        image and size are shared with the template particle
+    '''
+    __slots__ = ('_store', '_index', '_template')
+
+    def __init__(self, store: ParticleStore, index: int, template: Particle):
+        ''' point the view to the particle at index of the store'''
+        self._store = store
+        self._index = index
+        self._template = template
+
+
+    @property
+    def position(self) -> tuple[float, float]:
+        ''' returns the position of the particle'''
+        return (
+            float(self._store.x[self._index]),
+            float(self._store.y[self._index])
+        )
+
+
+    @property
+    def velocity(self) -> tuple[float, float]:
+        ''' returns the current speed of the particle'''
+        return (
+            float(self._store.vx[self._index]),
+            float(self._store.vy[self._index])
+        )
+
+
+    @property
+    def dimensions(self) -> tuple[float, float]:
+        ''' returns the dimensions of the particle (internal coords)'''
+        return self._template.dimensions
+
+
+    @property
+    def image(self) -> pygame.Surface:
+        ''' returns the image surface of the particle'''
+        return self._template.image
+
+
+    @property
+    def box(self) -> pygame.Rect:
+        ''' returns the pygame Rect of the particle'''
+        box = pygame.Rect((0, 0), self._template.box.size)
+        box.center = (
+            int(self._store.px[self._index]), int(self._store.py[self._index])
+        )
+        return box
@@ -0,0 +1,245 @@
+''' includes the ParticleStore class'''
+import numpy as np
+
+DEFAULT_CAPACITY = 1024
+
+
+class ParticleStore:
+    ''' keeps all live particles of an eruptor in contiguous numpy arrays
+        (structure of arrays). Slots [0, len) hold the live particles,
+        everything above is free space for new particles. The store works
+        as a pool: the slots of destroyed particles are reused, so once
+        the capacity covers the peak particle count, spawning does not
+        allocate anymore.
+    '''
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY,
+        max_capacity: int | None = None,
+        columns: dict[str, type] | None = None
+    ):
+        ''' allocate the arrays for the given number of particles.
+            max_capacity: the arrays never grow beyond this number of
+            particles, spawns that don't fit are dropped (None: no limit).
+            A larger capacity is reduced to it
+            columns: extra per-particle arrays as name: dtype. They are
+            zero for new particles and compacted with all others
+        '''
+        if not isinstance(capacity, int) or capacity <= 0:
+            print('ERROR: capacity must be positive integer!')
+            raise ValueError
+        if max_capacity is not None:
+            if not isinstance(max_capacity, int) or max_capacity <= 0:
+                print('ERROR: max_capacity must be positive integer!')
+                raise ValueError
+            capacity = min(capacity, max_capacity)
+        self._max_capacity = max_capacity
+        self._count = 0
+        self._stats = {
+            'high_water_mark': 0,
+            'recycled': 0,
+            'grown': 0,
+            'dropped': 0,
+        }
+        self._x = np.zeros(capacity)
+        self._y = np.zeros(capacity)
+        self._vx = np.zeros(capacity)
+        self._vy = np.zeros(capacity)
+        self._px = np.zeros(capacity, dtype=np.int64)
+        self._py = np.zeros(capacity, dtype=np.int64)
+        self._age = np.zeros(capacity, dtype=np.int64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._columns = {
+            name: np.zeros(capacity, dtype=dtype)
+            for name, dtype in (columns or {}).items()
+        }
+
+
+    def __len__(self):
+        ''' returns the number of live particles'''
+        return self._count
+
+
+    @property
+    def capacity(self):
+        ''' returns the number of particles that fit without reallocating'''
+        return self._x.shape[0]
+
+
+    @property
+    def max_capacity(self):
+        ''' returns the upper limit of the capacity (None: no limit)'''
+        return self._max_capacity
+
+
+    @property
+    def stats(self) -> dict[str, int]:
+        ''' returns the pool statistics:
+            capacity, live, high_water_mark (most particles alive at once),
+            recycled (spawns into previously used slots),
+            grown (number of reallocations), dropped (spawns over the limit)
+        '''
+        return {'capacity': self.capacity, 'live': self._count} | self._stats
+
+
+    @property
+    def x(self):
+        ''' returns the x positions (internal coords) of the live particles'''
+        return self._x[:self._count]
+
+
+    @property
+    def y(self):
+        ''' returns the y positions (internal coords) of the live particles'''
+        return self._y[:self._count]
+
+
+    @property
+    def vx(self):
+        ''' returns the x velocities of the live particles'''
+        return self._vx[:self._count]
+
+
+    @property
+    def vy(self):
+        ''' returns the y velocities of the live particles'''
+        return self._vy[:self._count]
+
+
+    @property
+    def px(self):
+        ''' returns the pixel x coordinates of the particle centers'''
+        return self._px[:self._count]
+
+
+    @property
+    def py(self):
+        ''' returns the pixel y coordinates of the particle centers'''
+        return self._py[:self._count]
+
+
+    @property
+    def age(self):
+        ''' returns the number of updates each live particle has survived'''
+        return self._age[:self._count]
+
+
+    @property
+    def alive(self):
+        ''' returns the alive mask of the live particles. Entries set to
+            False are removed with the next call to compact()
+        '''
+        return self._alive[:self._count]
+
+
+    def column(self, name: str) -> np.ndarray:
+        ''' returns the extra column name of the live particles'''
+        return self._columns[name][:self._count]
+
+
+    def spawn(self, x, y, vx, vy) -> int:
+        ''' add particles. Takes scalars or equally long arrays.
+            returns the number of particles that were actually added
+        '''
+        x, y, vx, vy = np.broadcast_arrays(
+            np.atleast_1d(x), np.atleast_1d(y),
+            np.atleast_1d(vx), np.atleast_1d(vy)
+        )
+        number = self._reserve(self._count + x.shape[0]) - self._count
+        if number < x.shape[0]:
+            self._stats['dropped'] += x.shape[0] - number
+            x, y, vx, vy = x[:number], y[:number], vx[:number], vy[:number]
+        start = self._count
+        end = start + number
+        high_water_mark = self._stats['high_water_mark']
+        self._stats['recycled'] += max(0, min(end, high_water_mark) - start)
+        self._stats['high_water_mark'] = max(end, high_water_mark)
+        self._x[start:end] = x
+        self._y[start:end] = y
+        self._vx[start:end] = vx
+        self._vy[start:end] = vy
+        self._px[start:end] = 0
+        self._py[start:end] = 0
+        self._age[start:end] = 0
+        self._alive[start:end] = True
+        for array in self._columns.values():
+            array[start:end] = 0
+        self._count = end
+        return number
+
+
+    def remove(self, index: int) -> None:
+        ''' removes a single particle by moving the last one into its slot'''
+        if not 0 <= index < self._count:
+            print('ERROR: index out of range!')
+            raise IndexError
+        last = self._count - 1
+        for array in self._arrays():
+            array[index] = array[last]
+        self._alive[last] = False
+        self._count = last
+
+
+    def compact(self) -> None:
+        ''' removes all particles whose alive entry is False in a single
+            pass. The survivors keep their order
+        '''
+        keep = self._alive[:self._count].copy()
+        number = int(np.count_nonzero(keep))
+        if number == self._count:
+            return
+        for array in self._arrays():
+            array[:number] = array[:self._count][keep]
+        self._alive[number:self._count] = False
+        self._count = number
+
+
+    def clear(self) -> None:
+        ''' removes all particles (keeps the allocated memory)'''
+        self._alive[:self._count] = False
+        self._count = 0
+
+
+    def _arrays(self) -> tuple[np.ndarray, ...]:
+        ''' returns all per-particle arrays'''
+        return (
+            self._x, self._y, self._vx, self._vy,
+            self._px, self._py, self._age, self._alive,
+            *self._columns.values()
+        )
+
+
+    def _reserve(self, needed: int) -> int:
+        ''' grows the arrays (doubling) until they can hold needed particles
+            or reach the max_capacity. returns the number of particles
+            the store can hold afterwards
+        '''
+        capacity = self.capacity
+        if needed <= capacity:
+            return needed
+        if self._max_capacity is not None:
+            needed = min(needed, self._max_capacity)
+            if needed <= capacity:
+                return needed
+        while capacity < needed:
+            capacity *= 2
+        if self._max_capacity is not None:
+            capacity = min(capacity, self._max_capacity)
+        self._stats['grown'] += 1
+        self._x = self._grown(self._x, capacity)
+        self._y = self._grown(self._y, capacity)
+        self._vx = self._grown(self._vx, capacity)
+        self._vy = self._grown(self._vy, capacity)
+        self._px = self._grown(self._px, capacity)
+        self._py = self._grown(self._py, capacity)
+        self._age = self._grown(self._age, capacity)
+        self._alive = self._grown(self._alive, capacity)
+        for name, array in self._columns.items():
+            self._columns[name] = self._grown(array, capacity)
+        return needed
+
+
+    def _grown(self, array: np.ndarray, capacity: int) -> np.ndarray:
+        ''' returns a copy of array with the new capacity'''
+        new_array = np.zeros(capacity, dtype=array.dtype)
+        new_array[:self._count] = array[:self._count]
+        return new_array
@@ -1,6 +1,8 @@
 ''' includes abcs Eruptor and Map, as well as concrete class Planet'''
 from abc import ABC
 from abc import abstractmethod
+from itertools import repeat
+import numpy as np
 import pygame
 from games.volcano_sim.pyclock import PyClock
 from games.volcano_sim.settings import Settings
@@ -17,11 +19,40 @@ class Eruptor(ABC):
     def particles(self):
         ''' concrete class must have a particles property'''
 
+    @property
+    @abstractmethod
+    def store(self):
+        ''' concrete class must keep its particles in a ParticleStore'''
+
+    @property
+    @abstractmethod
+    def default_particle(self):
+        ''' concrete class must provide the particle all others are based on
+            (image and size are shared)
+        '''
+
+    @property
+    @abstractmethod
+    def templates(self):
+        ''' concrete class must provide the particles the emitted ones
+            look like (several for several kinds of particles)
+        '''
+
+    @abstractmethod
+    def template_indices(self):
+        ''' concrete class must return the template of every particle
+            (None: all use the first)
+        '''
+
     @property
     @abstractmethod
     def gravity(self):
         ''' concrete class must have a gravity property'''
 
+    @abstractmethod
+    def step(self):
+        ''' concrete class must advance all particles by one tick'''
+
     @abstractmethod
     def update_particle_velocities(self):
         ''' concrete class must implement a way to update the velocities'''
@@ -42,6 +73,14 @@ class Eruptor(ABC):
     def erupt(self):
         ''' concrete class must implement a way to generate particles'''
 
+    @abstractmethod
+    def advance(self, ticks: int) -> int:
+        ''' concrete class must simulate ticks without rendering'''
+
+    @abstractmethod
+    def skip_to_next_eruption(self) -> int:
+        ''' concrete class must fast-forward to the next eruption'''
+
 
 class Map(ABC):
     ''' class to game_map the background and hold the particle effects'''
@@ -79,14 +118,14 @@ class Map(ABC):
         ''' concrete class must prove a blit_planet method'''
 
     @abstractmethod
-    def refresh_background(self) -> None:
-        ''' refreshes the background image'''
+    def refresh_background(self, rects: list[pygame.Rect] | None = None):
+        ''' refreshes the background image (or only the given rects)'''
 
 
 class Planet(CoordConverter, Map):
     ''' a class to create eruptions'''
     def __init__(
-        self, eruptor: Eruptor, settings: Settings, clock: PyClock
+        self, eruptor: Eruptor, settings: Settings, clock: PyClock | None
     ):
         super().__init__(settings)
         self._eruptor = eruptor
@@ -96,9 +135,11 @@ class Planet(CoordConverter, Map):
             (self._planet_rect.width, self._planet_rect.height)
         )
         self._planet_image.fill(settings.planet_color)
-        self._default_background = pygame.Surface(settings.window_size)
-        self._default_background.fill('purple')
+        self._planet_color = settings.planet_color
+        self._cones = self._get_cone_points(settings)
+        self._default_background = self._get_default_background()
         self._background = self._default_background.copy()
+        self._render_mode = settings.particle_render_mode
         self.clock = clock
 
 
@@ -142,15 +183,111 @@ class Planet(CoordConverter, Map):
 
 
     def blit_planet(self):
-        ''' blits the planet onto the background'''
+        ''' blits the planet onto the background. Not needed after a
+            refresh, the default background already contains the planet
+        '''
         self.background.blit(self._planet_image, self._planet_rect)
 
 
 
     def blit_volcano(self):
-        ''' blits the particles at their current positions'''
-        for particle in self.eruptor.particles:
-            self.background.blit(particle.image, particle.box)
+        ''' draws all particles at their current positions in one batch.
+            render modes: 'blits' (Surface.fblits/blits),
+            'pixels' (writes the particle colour straight into the pixels,
+            for small solid-colour particles)
+        '''
+        if self._render_mode == 'blits':
+            self._blit_particles()
+        elif self._render_mode == 'pixels':
+            self._draw_particle_pixels()
+        else:
+            print('ERROR: unknown particle render mode!')
+            raise ValueError
+
+
+    def particle_rects(self) -> list[pygame.Rect]:
+        ''' returns the rects currently covered by the particles'''
+        sizes, indices = self._particle_sizes()
+        left, top = self._particle_corners()
+        if indices is None:
+            width, height = sizes[0].tolist()
+            return [
+                pygame.Rect(x, y, width, height)
+                for x, y in zip(left.tolist(), top.tolist())
+            ]
+        return [
+            pygame.Rect(x, y, width, height)
+            for x, y, (width, height) in zip(
+                left.tolist(), top.tolist(), sizes[indices].tolist()
+            )
+        ]
+
+
+    def _particle_sizes(self) -> tuple[np.ndarray, np.ndarray | None]:
+        ''' returns the image sizes of the templates and the template of
+            every particle (None: all use the first)
+        '''
+        sizes = np.array([
+            template.image.get_size() for template in self.eruptor.templates
+        ])
+        return sizes, self.eruptor.template_indices()
+
+
+    def _particle_corners(self) -> tuple[np.ndarray, np.ndarray]:
+        ''' returns the top left pixel corners of all particle images'''
+        store = self.eruptor.store
+        sizes, indices = self._particle_sizes()
+        # same rounding as setting pygame.Rect.center:
+        halves = sizes // 2
+        halves = halves[0] if indices is None else halves[indices]
+        return store.px - halves[..., 0], store.py - halves[..., 1]
+
+
+    def _blit_particles(self):
+        ''' blits the template image once per particle in one call'''
+        templates = self.eruptor.templates
+        indices = self.eruptor.template_indices()
+        if indices is None:
+            images = repeat(templates[0].image)
+        else:
+            template_images = [template.image for template in templates]
+            images = [template_images[index] for index in indices.tolist()]
+        left, top = self._particle_corners()
+        sequence = zip(images, zip(left.tolist(), top.tolist()))
+        fblits = getattr(self.background, 'fblits', None)  # pygame-ce only
+        if fblits is not None:
+            fblits(sequence)
+        else:
+            self.background.blits(sequence, doreturn=False)
+
+
+    def _draw_particle_pixels(self):
+        ''' fills the pixels covered by the particles with their colour.
+            All templates must have the same size
+        '''
+        sizes, indices = self._particle_sizes()
+        if (sizes != sizes[0]).any():
+            print('ERROR: pixel rendering needs equally sized particles!')
+            raise ValueError
+        width, height = sizes[0].tolist()
+        colors = np.array([
+            self.background.map_rgb(template.image.get_at((0, 0)))
+            for template in self.eruptor.templates
+        ])
+        window_width, window_height = self.background.get_size()
+        left, top = self._particle_corners()
+        x = left[:, None, None] + np.arange(width)[None, None, :]
+        y = top[:, None, None] + np.arange(height)[None, :, None]
+        x, y = np.broadcast_arrays(x, y)
+        inside = (x >= 0) & (x < window_width) & (y >= 0) & (y < window_height)
+        pixels = pygame.surfarray.pixels2d(self.background)
+        if indices is None:
+            pixels[x[inside], y[inside]] = colors[0]
+        else:
+            pixels[x[inside], y[inside]] = np.broadcast_to(
+                colors[indices][:, None, None], x.shape
+            )[inside]
+        del pixels  # unlocks the background surface
 
 
     def _get_planet_rect(self) -> pygame.Rect:
@@ -167,7 +304,43 @@ class Planet(CoordConverter, Map):
         return planet_rect
 
 
-    def refresh_background(self):
-        ''' refreshes the background image'''
-        self.background = pygame.Surface(size=self.window_size)
-        self.background.fill('purple')
+    def _get_default_background(self) -> pygame.Surface:
+        ''' builds the static background with the planet already on it'''
+        default_background = pygame.Surface(self.window_size)
+        default_background.fill('purple')
+        default_background.blit(self._planet_image, self._planet_rect)
+        for cone in self._cones:
+            pygame.draw.polygon(default_background, self._planet_color, cone)
+        return default_background
+
+
+    def _get_cone_points(self, settings: Settings) -> list[list]:
+        ''' returns the pixel corners of the terrain_cone at every vent'''
+        if settings.terrain_cone is None:
+            return []
+        cone_height, half_width = settings.terrain_cone
+        ground = self.planet_dimensions[1]
+        return [
+            [
+                self.convert_internals_to_px(point) for point in (
+                    (vent_x - half_width, ground),
+                    (vent_x, ground + cone_height),
+                    (vent_x + half_width, ground),
+                )
+            ]
+            for vent_x, _ in settings.vent_positions
+            or [settings.starting_position]
+        ]
+
+
+    def refresh_background(self, rects: list[pygame.Rect] | None = None):
+        ''' restores the static background (planet included) in place.
+            rects: only restore these areas (None: the whole window)
+        '''
+        if rects is None:
+            self.background.blit(self._default_background, (0, 0))
+        else:
+            self.background.blits(
+                ((self._default_background, rect, rect) for rect in rects),
+                doreturn=False
+            )
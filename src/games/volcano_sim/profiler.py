@@ -0,0 +1,135 @@
+''' includes the FrameProfiler class to see where the frame time goes'''
+import cProfile
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    ''' times named phases of every frame and keeps the last window
+        frames to report rolling percentiles. Can also wrap a number of
+        frames in cProfile and dump the stats to a file
+    '''
+    def __init__(self, window: int = 300, enabled: bool = True):
+        ''' window: number of frames the percentiles are calculated over'''
+        if not isinstance(window, int) or window <= 0:
+            print('ERROR: window must be positive integer!')
+            raise ValueError
+        self._window = window
+        self._enabled = enabled
+        self._timings = {}
+        self._particle_counts = deque(maxlen=window)
+        self._frames = 0
+        self._profile = None
+        self._profile_frames_left = 0
+        self._profile_path = None
+
+
+    @property
+    def enabled(self) -> bool:
+        ''' returns whether the phases are timed'''
+        return self._enabled
+
+
+    @property
+    def frames(self) -> int:
+        ''' returns the number of finished frames'''
+        return self._frames
+
+
+    @property
+    def particle_counts(self) -> np.ndarray:
+        ''' returns the particle counts of the last frames'''
+        return np.array(self._particle_counts)
+
+
+    @property
+    def profiling(self) -> bool:
+        ''' returns whether frames are currently wrapped in cProfile'''
+        return self._profile is not None
+
+
+    def phase(self, name: str):
+        ''' context manager timing one phase of the current frame'''
+        if not self._enabled:
+            return nullcontext()
+        return self._timed_phase(name)
+
+
+    @contextmanager
+    def _timed_phase(self, name: str):
+        ''' records the duration of the with block under name'''
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if name not in self._timings:
+                self._timings[name] = deque(maxlen=self._window)
+            self._timings[name].append(time.perf_counter() - start)
+
+
+    def end_frame(self, particles: int = 0) -> None:
+        ''' closes the current frame, recording its particle count'''
+        self._frames += 1
+        if self._enabled:
+            self._particle_counts.append(particles)
+        if self._profile is not None:
+            self._profile_frames_left -= 1
+            if self._profile_frames_left <= 0:
+                self._stop_profile()
+
+
+    def profile_frames(self, frames: int, path: str) -> None:
+        ''' wraps the next frames in cProfile, the stats are dumped to path.
+            Ignored while a profile is already running
+        '''
+        if self._profile is not None:
+            return
+        if not isinstance(frames, int) or frames <= 0:
+            print('ERROR: frames must be positive integer!')
+            raise ValueError
+        self._profile_frames_left = frames
+        self._profile_path = path
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+
+    def _stop_profile(self) -> None:
+        ''' stops the running profile and writes its stats'''
+        self._profile.disable()
+        self._profile.dump_stats(self._profile_path)
+        self._profile = None
+
+
+    def percentiles(self, name: str) -> dict[str, float]:
+        ''' returns the p50/p95/p99 duration of a phase in milliseconds'''
+        if not self._timings.get(name):
+            return {f'p{percentile}': 0. for percentile in PERCENTILES}
+        values = np.percentile(
+            np.array(self._timings[name]) * 1000, PERCENTILES
+        )
+        return {
+            f'p{percentile}': float(value)
+            for percentile, value in zip(PERCENTILES, values)
+        }
+
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        ''' returns the percentiles of all phases, by phase name'''
+        return {name: self.percentiles(name) for name in self._timings}
+
+
+    def overlay_lines(self) -> list[str]:
+        ''' returns the summary as short text lines for the screen'''
+        counts = self._particle_counts
+        lines = [f'particles: {counts[-1] if counts else 0}']
+        for name, values in self.summary().items():
+            lines.append(
+                f'{name}: ' + ' '.join(
+                    f'{key} {value:.2f}' for key, value in values.items()
+                ) + ' ms'
+            )
+        return lines
@@ -1,9 +1,61 @@
-''' defines the clock related class'''
+''' defines the clock related classes'''
+import math
+import time
 import pygame
 from games.volcano_sim.coord_converter import CoordConverter
 from games.volcano_sim.settings import Settings
 
 
+class GlyphText:
+    ''' renders text by composing cached glyph surfaces, so every
+        character is rasterized by the font only once. Rendering the
+        same text twice in a row returns the same surface
+    '''
+    def __init__(
+        self, font: pygame.font.Font, color=(0, 0, 0), antialias=False
+    ):
+        ''' the font, colour and antialiasing used for all glyphs'''
+        self._font = font
+        self._color = color
+        self._antialias = antialias
+        self._glyphs = {}
+        self._text = None
+        self._image = None
+
+
+    @property
+    def glyphs(self) -> int:
+        ''' returns the number of cached glyphs'''
+        return len(self._glyphs)
+
+
+    def render(self, text: str) -> pygame.Surface:
+        ''' returns the text as a surface (only re-rendered on change)'''
+        if text == self._text:
+            return self._image
+        glyphs = [self._glyph(character) for character in text]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        image = pygame.Surface(
+            (width, self._font.get_height()), pygame.SRCALPHA
+        )
+        left = 0
+        for glyph in glyphs:
+            image.blit(glyph, (left, 0))
+            left += glyph.get_width()
+        self._text = text
+        self._image = image
+        return image
+
+
+    def _glyph(self, character: str) -> pygame.Surface:
+        ''' returns the cached surface of a single character'''
+        glyph = self._glyphs.get(character)
+        if glyph is None:
+            glyph = self._font.render(character, self._antialias, self._color)
+            self._glyphs[character] = glyph
+        return glyph
+
+
 class PyClock(CoordConverter):
     ''' handles the clock as well as the clock image'''
     def __init__(self, settings: Settings):
@@ -11,17 +63,66 @@ class PyClock(CoordConverter):
         self._clock = pygame.time.Clock()
         self.font = pygame.font.SysFont('Comic Sans MS', 20)
         self._dimensions = settings.clock_dimensions
-        self._image = self.font.render(
-            str(self.clock.get_time()), False, (0, 0, 0)
-        )
+        self._text = GlyphText(self.font)
+        self._image = self._text.render(str(self.clock.get_time()))
+        self._refresh_interval = 1 / settings.clock_refresh_hz  # seconds
+        self._last_refresh = time.monotonic()
         self._box = self._get_box()
+        self._physics_step = 1000 / settings.physics_hz  # milliseconds
+        self._fps_cap = settings.fps_cap
+        self._max_substeps = settings.max_substeps
+        self._accumulator = 0.0
+        self.time_scale = settings.time_scale
+
+
+    @property
+    def time_scale(self) -> float:
+        ''' returns the simulation speed (1: real time)'''
+        return self._time_scale
+
+
+    @time_scale.setter
+    def time_scale(self, new_scale: float):
+        ''' sets the simulation speed, the max steps per frame scale too'''
+        if not new_scale > 0:
+            print('ERROR: time_scale must be positive!')
+            raise ValueError
+        self._time_scale = new_scale
+        self._max_scaled_steps = math.ceil(self._max_substeps * new_scale)
+
+
+    def tick(self) -> int:
+        ''' waits for the next frame (respecting the fps cap) and
+            returns the number of physics steps due for this frame
+        '''
+        return self.add_time(self.clock.tick(self._fps_cap))
+
+
+    def add_time(self, elapsed: float) -> int:
+        ''' adds elapsed milliseconds (times the time_scale) to the
+            accumulator and takes out as many fixed physics steps as fit,
+            at most max_substeps (times the time_scale).
+            A larger backlog is dropped so a slow frame can't snowball
+        '''
+        self._accumulator += elapsed * self._time_scale
+        steps = int(self._accumulator // self._physics_step)
+        if steps > self._max_scaled_steps:
+            steps = self._max_scaled_steps
+            self._accumulator = 0.0
+        else:
+            self._accumulator -= steps * self._physics_step
+        return steps
 
 
     def update_image(self):
-        ''' updates the image of the clock to reflect the current time'''
-        self._image = self.font.render(
-            self.clock.get_time(), antialias=False, color=(0, 0, 0)
-        )
+        ''' updates the image of the clock to reflect the current time,
+            at most clock_refresh_hz times per second
+        '''
+        now = time.monotonic()
+        if now - self._last_refresh < self._refresh_interval:
+            return
+        self._last_refresh = now
+        self._image = self._text.render(str(self.clock.get_time()))
 
     def _get_box(self):
         ''' generate the '''
@@ -0,0 +1,221 @@
+''' includes the Recorder writing simulation runs to a compact binary
+    file and the Recording reading them back.
+    Layout (little endian): a header (magic, version, mode, seed,
+    gravity, integrator, substeps, collision, interactions), then one
+    record per spawn (mode 'events': tick, count and x, y, vx, vy as
+    float64) or per tick (mode 'states': tick, count and x, y as float32)
+'''
+import struct
+import numpy as np
+from games.volcano_sim.integrators import INTEGRATORS
+from games.volcano_sim.terrain import COLLISIONS
+
+MAGIC = b'VSIM'
+VERSION = 2
+MODES = ('events', 'states')
+NO_SEED = -1  # stored instead of None
+NO_COLLISION = 0  # stored instead of None, the others are 1 + index
+
+_HEADER = struct.Struct('<4sBBqddBIB?')
+_RECORD = struct.Struct('<qI')  # tick, count
+_EVENT_DTYPE = np.dtype('<f8')
+_STATE_DTYPE = np.dtype('<f4')
+
+
+def _check_mode(mode: str):
+    ''' raises a ValueError for unknown modes'''
+    if mode not in MODES:
+        print(f'ERROR: mode must be one of {", ".join(MODES)}!')
+        raise ValueError
+
+
+class Recorder:
+    ''' streams a run to disk. 'events' only keeps the spawned particles
+        (a replay recalculates their paths), 'states' keeps the positions
+        of all particles after every tick
+    '''
+    def __init__(
+        self, path: str, mode: str = 'events', seed: int | None = None,
+        gravity: tuple[float, float] = (0, 0), integrator: str = 'euler',
+        substeps: int = 1, collision: str | None = None,
+        interactions: bool = False
+    ):
+        ''' open path and write the header. integrator, substeps,
+            collision and interactions describe how the run was simulated,
+            so a replay can tell whether it reproduces it
+        '''
+        _check_mode(mode)
+        if seed is not None and seed < 0:
+            print('ERROR: seed must not be negative!')
+            raise ValueError
+        if (integrator not in INTEGRATORS
+                or (collision is not None and collision not in COLLISIONS)):
+            print('ERROR: unknown integrator or collision!')
+            raise ValueError
+        self._mode = mode
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(
+            MAGIC, VERSION, MODES.index(mode),
+            NO_SEED if seed is None else seed, *gravity,
+            list(INTEGRATORS).index(integrator), substeps,
+            NO_COLLISION if collision is None
+            else COLLISIONS.index(collision) + 1,
+            interactions
+        ))
+
+
+    @classmethod
+    def from_settings(cls, path: str, settings, mode: str | None = None):
+        ''' alternative constructor: records a run simulated with settings
+            (mode None: settings.record_mode)
+        '''
+        return cls(
+            path, settings.record_mode if mode is None else mode,
+            settings.seed, settings.gravity, settings.integrator,
+            settings.substeps, settings.collision,
+            settings.interaction_radius is not None
+        )
+
+
+    def __enter__(self):
+        ''' use the recorder as context manager'''
+        return self
+
+
+    def __exit__(self, *exc_info):
+        ''' close the file when leaving the context'''
+        self.close()
+
+
+    @property
+    def mode(self) -> str:
+        ''' returns 'events' or 'states' '''
+        return self._mode
+
+
+    def record_spawn(self, tick: int, x, y, x_velocity, y_velocity):
+        ''' writes the particles spawned at tick ('events' mode only)'''
+        if self._mode == 'events':
+            self._write(tick, (x, y, x_velocity, y_velocity), _EVENT_DTYPE)
+
+
+    def record_state(self, tick: int, x, y):
+        ''' writes the positions of all particles ('states' mode only)'''
+        if self._mode == 'states':
+            self._write(tick, (x, y), _STATE_DTYPE)
+
+
+    def close(self):
+        ''' flushes and closes the file'''
+        self._file.close()
+
+
+    def _write(self, tick: int, arrays, dtype: np.dtype):
+        ''' writes one record'''
+        count = len(arrays[0])
+        self._file.write(_RECORD.pack(tick, count))
+        for array in arrays:
+            self._file.write(
+                np.broadcast_to(np.asarray(array, dtype), count).tobytes()
+            )
+
+
+class Recording:
+    ''' a recorded run, read completely into memory'''
+    def __init__(self, path: str):
+        ''' read and check the file at path'''
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < _HEADER.size:
+            print(f'ERROR: {path} is no recording of this version!')
+            raise ValueError
+        (magic, version, mode, seed, x_gravity, y_gravity, integrator,
+         substeps, collision, interactions) = _HEADER.unpack_from(data)
+        if (magic != MAGIC or version != VERSION or mode >= len(MODES)
+                or integrator >= len(INTEGRATORS)
+                or collision > len(COLLISIONS)):
+            print(f'ERROR: {path} is no recording of this version!')
+            raise ValueError
+        self._mode = MODES[mode]
+        self._seed = None if seed == NO_SEED else seed
+        self._gravity = (x_gravity, y_gravity)
+        self._integrator = list(INTEGRATORS)[integrator]
+        self._substeps = substeps
+        self._collision = None if collision == NO_COLLISION \
+            else COLLISIONS[collision - 1]
+        self._interactions = interactions
+        self._ticks = []
+        self._records = []  # per record: tuple of arrays
+        dtype = _EVENT_DTYPE if self._mode == 'events' else _STATE_DTYPE
+        columns = 4 if self._mode == 'events' else 2
+        offset = _HEADER.size
+        while offset < len(data):
+            tick, count = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            arrays = np.frombuffer(
+                data, dtype, count * columns, offset
+            ).reshape(columns, count)
+            offset += arrays.nbytes
+            self._ticks.append(tick)
+            self._records.append(tuple(arrays))
+
+
+    def __len__(self):
+        ''' returns the number of records'''
+        return len(self._records)
+
+
+    @property
+    def mode(self) -> str:
+        ''' returns 'events' or 'states' '''
+        return self._mode
+
+
+    @property
+    def seed(self) -> int | None:
+        ''' returns the seed of the recorded run'''
+        return self._seed
+
+
+    @property
+    def gravity(self) -> tuple[float, float]:
+        ''' returns the gravity of the recorded run'''
+        return self._gravity
+
+
+    @property
+    def integrator(self) -> str:
+        ''' returns the integrator of the recorded run'''
+        return self._integrator
+
+
+    @property
+    def substeps(self) -> int:
+        ''' returns the integrator steps per tick of the recorded run'''
+        return self._substeps
+
+
+    @property
+    def collision(self) -> str | None:
+        ''' returns the collision response of the recorded run'''
+        return self._collision
+
+
+    @property
+    def interactions(self) -> bool:
+        ''' returns True if the particles of the recorded run interacted'''
+        return self._interactions
+
+
+    @property
+    def ticks(self) -> list[int]:
+        ''' returns the tick of every record, in order'''
+        return self._ticks
+
+
+    @property
+    def records(self) -> list[tuple]:
+        ''' returns the arrays of every record: (x, y, vx, vy) for
+            'events', (x, y) for 'states'
+        '''
+        return self._records
@@ -0,0 +1,176 @@
+''' replay recorded runs in the game window.
+    run: python -m games.volcano_sim.replay run.vsim --start 600
+'''
+
+import argparse
+import pygame
+from games.volcano_sim.settings import Settings
+from games.volcano_sim.pyclock import PyClock
+from games.volcano_sim.planet import Planet
+from games.volcano_sim.particle import Particle
+from games.volcano_sim.volcano import Volcano, AnalyticVolcano
+from games.volcano_sim.recording import Recording
+from games.volcano_sim import trajectories
+from games.volcano_sim.main import Game
+
+# ==========================================================================
+#                         REPLAYING ERUPTORS
+# ==========================================================================
+
+class ReplayVolcano(AnalyticVolcano):
+    ''' spawns the particles of an 'events' recording instead of erupting.
+        The particles follow the closed-form paths of AnalyticVolcano, so
+        any tick can be reached without simulating the ones before (exact
+        for runs under constant gravity with the 'euler' integrator)
+    '''
+    def __init__(
+        self, settings: Settings, default_particle: Particle,
+        recording: Recording
+    ):
+        ''' replay recording with the gravity it was recorded with'''
+        if recording.mode != 'events':
+            print('ERROR: ReplayVolcano needs an \'events\' recording!')
+            raise ValueError
+        if (recording.integrator != 'euler' or recording.substeps != 1
+                or recording.collision is not None
+                or recording.interactions):
+            print('ERROR: only runs with the \'euler\' integrator, no '
+                  'substeps, collisions or interactions can be replayed '
+                  'from events, record \'states\' instead!')
+            raise ValueError
+        super().__init__(settings, default_particle, profiles=[])
+        self._gravity = recording.gravity
+        self._event_ticks = recording.ticks
+        self._events = recording.records
+        self._next_event = 0
+
+
+    @property
+    def finished(self) -> bool:
+        ''' returns True once all recorded events have been spawned'''
+        return self._next_event >= len(self._events)
+
+
+    def erupt(self):
+        ''' spawns the recorded events of the current tick'''
+        self._spawn_events(self._tick + 1)
+
+
+    def seek(self, tick: int):
+        ''' jumps to tick, forward or backward, as if every tick before it
+            had been played
+        '''
+        if tick < self._tick:
+            self._rewind()
+        self._spawn_events(tick)
+        self._tick = tick
+        self._evaluated_tick = -1  # spawns happened at other ticks
+
+
+    def _idle_ticks(self) -> int:
+        ''' returns the number of ticks until the next recorded event'''
+        if self.finished:
+            return trajectories.NEVER
+        return max(self._event_ticks[self._next_event] - self._tick, 0)
+
+
+    def _rewind(self):
+        ''' goes back to the start of the recording'''
+        self._store.clear()
+        self._exits = []
+        self._next_uid = 0
+        self._next_event = 0
+        self._tick = 0
+
+
+    def _spawn_events(self, end: int):
+        ''' spawns all events before tick end, each at its own tick'''
+        tick = self._tick
+        while (not self.finished
+               and self._event_ticks[self._next_event] < end):
+            self._tick = self._event_ticks[self._next_event]
+            self._spawn(*self._events[self._next_event])
+            self._next_event += 1
+        self._tick = tick
+
+
+class StateReplayVolcano(Volcano):
+    ''' shows the particle positions of a 'states' recording, tick by
+        tick. Nothing is simulated
+    '''
+    def __init__(
+        self, settings: Settings, default_particle: Particle,
+        recording: Recording
+    ):
+        ''' replay recording from tick 0'''
+        if recording.mode != 'states':
+            print('ERROR: StateReplayVolcano needs a \'states\' recording!')
+            raise ValueError
+        super().__init__(settings, default_particle, profiles=[])
+        self._frames = dict(zip(recording.ticks, recording.records))
+        self._last_tick = max(recording.ticks, default=0)
+
+
+    @property
+    def finished(self) -> bool:
+        ''' returns True once the last recorded tick has been shown'''
+        return self._tick >= self._last_tick
+
+
+    def erupt(self):
+        ''' nothing to do, the states contain all particles'''
+
+
+    def destroy_out_of_bounds(self):
+        ''' nothing to do, the states only contain recorded particles'''
+
+
+    def step(self):
+        ''' shows the next recorded tick'''
+        self.seek(self._tick + 1)
+
+
+    def advance(self, ticks: int) -> int:
+        ''' jumps ticks ahead, returns the number of ticks advanced'''
+        self.seek(self._tick + ticks)
+        return ticks
+
+
+    def seek(self, tick: int):
+        ''' shows the recorded tick (no particles if it wasn't recorded)'''
+        self._tick = tick
+        self._store.clear()
+        if tick in self._frames:
+            x, y = self._frames[tick]
+            self._store.spawn(x, y, 0, 0)
+            self.update_pixel_centers()
+
+
+def build_replay(recording: Recording, settings: Settings) -> Volcano:
+    ''' returns the eruptor replaying the recording'''
+    if recording.mode == 'events':
+        return ReplayVolcano(settings, Particle(settings), recording)
+    return StateReplayVolcano(settings, Particle(settings), recording)
+
+# ======================================================================
+#                           DRIVER CODE:
+# ======================================================================
+
+def main():
+    ''' driver code'''
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path')
+    parser.add_argument('--start', type=int, default=0, help='first tick')
+    arguments = parser.parse_args()
+    pygame.font.init()
+    settings = Settings()
+    volcano = build_replay(Recording(arguments.path), settings)
+    volcano.seek(arguments.start)
+    clock = PyClock(settings)
+    planet = Planet(volcano, settings, clock)
+    game = Game(planet, settings, clock)
+    game.main_loop()
+
+
+if __name__ == '__main__':
+    main()
@@ -12,12 +12,45 @@ class Settings:
     starting_position = (0.5, 0)  # always start at bottom in the middle
     concurrent_expulsions = 1
     clock_dimensions = (.1, .2)
+    clock_refresh_hz = 4  # max redraws of the clock text per second
 
     def __init__(self):
         ''' initialzes a settings object so there are no namespace clashes'''
         self.randomness = True
+        self.seed = None  # int: reproducible runs, None: every run differs
         self.velocity_spread = .001
         self.angle_spread = 2
-        self.eruption_frequency = 10_000  # erupt every nth frame
-        self.eruption_time = 20  # seconds
-        self.eruption_downtime = 60  # seconds
+        self.velocity_distribution = 'uniform'  # or 'normal', 'truncated'
+        self.eruption_frequency = 1  # ticks between expulsions
+        self.eruption_time = 20  # ticks an eruption lasts
+        self.eruption_downtime = 60  # ticks between eruptions
+        self.particle_capacity = 4096  # preallocated particle slots
+        self.max_particles = None  # None: the particle store grows freely
+        self.particle_render_mode = 'blits'  # or 'pixels' (tiny particles)
+        self.dirty_rects = False  # only push the changed areas to the screen
+        self.max_dirty_rects = 1_000  # above this, update the whole screen
+        self.physics_hz = 60  # fixed physics steps per second
+        self.fps_cap = 60  # max rendered frames per second (0: no cap)
+        self.max_substeps = 5  # max physics steps per rendered frame
+        self.time_scale = 1.0  # simulation speed multiplier
+        self.analytic_trajectories = False  # closed-form particle paths
+        self.integrator = 'euler'  # or 'verlet', 'rk4'
+        self.substeps = 1  # integrator steps per physics step
+        self.profile_phases = False  # time the phases of every frame
+        self.profile_window = 300  # frames for the rolling percentiles
+        self.profile_overlay = False  # show the phase timings on screen
+        self.cprofile_frames = 0  # frames profiled when p is pressed
+        self.cprofile_path = 'volcano_sim.prof'
+        self.record_path = None  # file the run is recorded to (None: off)
+        self.record_mode = 'events'  # or 'states' (positions every tick)
+        self.collision = None  # or 'stop', 'bounce', 'deposit' (pile up)
+        self.restitution = .5  # share of the vertical speed kept bouncing
+        self.deposit_height = .0005  # ground raised per deposited particle
+        self.terrain_columns = 1280  # resolution of the ground heights
+        self.terrain_cone = None  # (height, half width) of a cone at the vent
+        self.interaction_radius = None  # None: particles don't interact
+        self.interaction_strength = 1e-7  # < 0: particles clump together
+        self.heatmap_overlay = False  # show where particles fly and land
+        self.heatmap_resolution = (128, 78)  # density bins in x and y
+        self.heatmap_refresh_ticks = 15  # ticks between overlay redraws
+        self.vent_positions = None  # several vents (None: starting_position)
@@ -0,0 +1,138 @@
+''' includes the SpatialGrid class'''
+import math
+import numpy as np
+
+# neighbour cells (dx, dy) so that every pair of adjacent cells is
+# visited once: the own cell, right, and the three cells above
+HALF_STENCIL = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+class SpatialGrid:
+    ''' uniform grid over the window (internal coords 0 to 1) for finding
+        close particles without comparing all pairs. build() bucket sorts
+        the particles into the cells with one argsort, the particles of a
+        cell are then a contiguous range of the sorted order. Particles
+        outside the window are put into the border cells
+    '''
+    def __init__(self, cell_size: float):
+        ''' cell_size: minimum width and height of a cell, at least the
+            largest distance queried
+        '''
+        if not 0 < cell_size <= 1:
+            print('ERROR: cell_size must be in (0, 1]!')
+            raise ValueError
+        self._cells = max(math.floor(1 / cell_size), 1)  # per axis
+        self._order = np.empty(0, dtype=np.intp)
+        self._starts = np.zeros(self._cells ** 2 + 1, dtype=np.intp)
+        self._cell_x = np.empty(0, dtype=np.intp)
+        self._cell_y = np.empty(0, dtype=np.intp)
+
+
+    def __len__(self):
+        ''' returns the number of particles in the grid'''
+        return len(self._order)
+
+
+    @property
+    def cells(self) -> int:
+        ''' returns the number of cells along each axis'''
+        return self._cells
+
+
+    @property
+    def order(self) -> np.ndarray:
+        ''' returns the particle indices sorted by cell'''
+        return self._order
+
+
+    @property
+    def starts(self) -> np.ndarray:
+        ''' returns where each cell (y * cells + x) begins in order, plus
+            the total number of particles at the end
+        '''
+        return self._starts
+
+
+    def build(self, x: np.ndarray, y: np.ndarray):
+        ''' sorts the particles at x, y into the cells'''
+        self._cell_x = self._cell_indices(x)
+        self._cell_y = self._cell_indices(y)
+        cell = self._cell_y * self._cells + self._cell_x
+        self._order = np.argsort(cell, kind='stable')
+        self._starts[0] = 0
+        np.cumsum(
+            np.bincount(cell, minlength=self._cells ** 2),
+            out=self._starts[1:]
+        )
+
+
+    def query(self, x: float, y: float) -> np.ndarray:
+        ''' returns the indices of the particles in the cell of the point
+            x, y and the eight cells around it (all candidates closer than
+            cell_size)
+        '''
+        cells = self._cells
+        cell_x = int(self._cell_indices(np.asarray(x)))
+        cell_y = int(self._cell_indices(np.asarray(y)))
+        left, right = max(cell_x - 1, 0), min(cell_x + 1, cells - 1)
+        bottom, top = max(cell_y - 1, 0), min(cell_y + 1, cells - 1)
+        return np.concatenate([
+            self._order[self._starts[row * cells + left]
+                        :self._starts[row * cells + right + 1]]
+            for row in range(bottom, top + 1)
+        ])
+
+
+    def pairs(
+        self, x: np.ndarray, y: np.ndarray, radius: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        ''' returns the indices (first, second) of all pairs of particles
+            closer than radius (each pair once). x and y must be the
+            positions the grid was built from
+        '''
+        cells = self._cells
+        cell_x = self._cell_x[self._order]
+        cell_y = self._cell_y[self._order]
+        positions = np.arange(len(self._order))
+        firsts, seconds = [], []
+        for x_offset, y_offset in HALF_STENCIL:
+            neighbour_x = cell_x + x_offset
+            neighbour_y = cell_y + y_offset
+            valid = (neighbour_x >= 0) & (neighbour_x < cells) \
+                & (neighbour_y < cells)
+            neighbour = np.where(valid, neighbour_y * cells + neighbour_x, 0)
+            begin = self._starts[neighbour]
+            end = np.where(valid, self._starts[neighbour + 1], begin)
+            if (x_offset, y_offset) == (0, 0):
+                begin = positions + 1  # only the later ones of the own cell
+            lengths = np.maximum(end - begin, 0)
+            # consecutive runs begin, begin + 1, ... for each particle:
+            run_starts = np.cumsum(lengths) - lengths
+            firsts.append(np.repeat(positions, lengths))
+            seconds.append(
+                np.repeat(begin - run_starts, lengths)
+                + np.arange(lengths.sum())
+            )
+        first = self._order[np.concatenate(firsts)]
+        second = self._order[np.concatenate(seconds)]
+        close = (x[first] - x[second]) ** 2 + (y[first] - y[second]) ** 2 \
+            < radius ** 2
+        return first[close], second[close]
+
+
+    def neighbour_counts(
+        self, x: np.ndarray, y: np.ndarray, radius: float
+    ) -> np.ndarray:
+        ''' returns the number of particles closer than radius to each
+            particle (its local density)
+        '''
+        first, second = self.pairs(x, y, radius)
+        return np.bincount(first, minlength=len(x)) \
+            + np.bincount(second, minlength=len(x))
+
+
+    def _cell_indices(self, coords: np.ndarray) -> np.ndarray:
+        ''' returns the cell index along one axis of each coordinate'''
+        return np.clip(
+            np.floor(coords * self._cells), 0, self._cells - 1
+        ).astype(np.intp)
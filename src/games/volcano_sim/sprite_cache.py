@@ -0,0 +1,96 @@
+''' includes the SpriteCache class and the cache shared by all particles'''
+from collections import OrderedDict
+import pygame
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class SpriteCache:
+    ''' least recently used cache of solid-colour sprite surfaces, keyed
+        by pixel size, colour and alpha. Surfaces are converted to the
+        display format as soon as there is a display, so blits take the
+        fast path
+    '''
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        ''' max_bytes: pixel memory the cached surfaces may use together'''
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            print('ERROR: max_bytes must be positive integer!')
+            raise ValueError
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._sprites = OrderedDict()  # key: [surface, converted]
+
+
+    def __len__(self):
+        ''' returns the number of cached sprites'''
+        return len(self._sprites)
+
+
+    @property
+    def bytes(self) -> int:
+        ''' returns the pixel memory used by the cached sprites'''
+        return self._bytes
+
+
+    def get(
+        self, size: tuple[int, int], color, alpha: int | None = None
+    ) -> pygame.Surface:
+        ''' returns the sprite of the given size filled with color.
+            alpha: None for an opaque sprite, else 0 (clear) to 255
+        '''
+        key = (tuple(size), tuple(pygame.Color(color)), alpha)
+        entry = self._sprites.get(key)
+        if entry is None:
+            entry = self._add(key)
+        else:
+            self._sprites.move_to_end(key)
+        if not entry[1] and pygame.display.get_surface() is not None:
+            self._bytes -= self._size_in_bytes(entry[0])
+            entry[0] = self._converted(entry[0], alpha)
+            entry[1] = True
+            self._bytes += self._size_in_bytes(entry[0])
+        return entry[0]
+
+
+    def clear(self) -> None:
+        ''' removes all sprites'''
+        self._sprites.clear()
+        self._bytes = 0
+
+
+    def _add(self, key) -> list:
+        ''' creates the sprite for key and evicts the least recently used
+            sprites until the cache fits into max_bytes again
+        '''
+        size, color, alpha = key
+        if alpha is None:
+            surface = pygame.Surface(size)
+            surface.fill(color)
+        else:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill((*color[:3], alpha))
+        entry = [surface, False]
+        self._sprites[key] = entry
+        self._bytes += self._size_in_bytes(surface)
+        while self._bytes > self._max_bytes and len(self._sprites) > 1:
+            _, (evicted, _) = self._sprites.popitem(last=False)
+            self._bytes -= self._size_in_bytes(evicted)
+        return entry
+
+
+    def _converted(
+        self, surface: pygame.Surface, alpha: int | None
+    ) -> pygame.Surface:
+        ''' returns the surface in the pixel format of the display'''
+        if alpha is None:
+            return surface.convert()
+        return surface.convert_alpha()
+
+
+    def _size_in_bytes(self, surface: pygame.Surface) -> int:
+        ''' returns the pixel memory of a surface'''
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+
+SPRITE_CACHE = SpriteCache()
@@ -0,0 +1,182 @@
+''' runs headless simulations for many settings on all cores.
+    run: python -m games.volcano_sim.sweep --grid gravity=-1e-5,-1e-4
+         --grid angle_spread=2,10 --ticks 2000 --output results.npz
+    or sample configurations at random:
+         ... --sample 200 --range default_velocity=.001,.004
+'''
+
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from games.volcano_sim.settings import Settings
+from games.volcano_sim.headless import build_headless
+from games.volcano_sim.heatmap import HeatmapAccumulator
+
+SWEEP_FIELDS = (
+    'gravity',  # a number is the vertical component
+    'default_velocity',
+    'velocity_spread',
+    'angle_spread',
+    'eruption_frequency',
+    'concurrent_expulsions',
+)
+INTEGER_FIELDS = ('eruption_frequency', 'concurrent_expulsions')
+LANDING_BINS = 20  # bins of the landing histogram across the window
+
+# ==========================================================================
+#                         CONFIGURATIONS
+# ==========================================================================
+
+def grid(**values) -> list[dict]:
+    ''' returns every combination of the given values per field'''
+    names = list(values)
+    return [
+        dict(zip(names, combination))
+        for combination in itertools.product(*values.values())
+    ]
+
+
+def random_sample(
+    count: int, seed: int | None = None, **ranges
+) -> list[dict]:
+    ''' returns count configurations with each field drawn uniformly
+        from its (low, high) range
+    '''
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (low, high) in ranges.items():
+        column = rng.uniform(low, high, count)
+        if name in INTEGER_FIELDS:
+            column = np.maximum(np.rint(column), 1).astype(int)
+        columns[name] = column.tolist()
+    return [
+        {name: column[index] for name, column in columns.items()}
+        for index in range(count)
+    ]
+
+
+def apply(configuration: dict) -> Settings:
+    ''' returns default settings with the fields of configuration'''
+    settings = Settings()
+    for name, value in configuration.items():
+        if name not in SWEEP_FIELDS:
+            print(f'ERROR: can only sweep {", ".join(SWEEP_FIELDS)}!')
+            raise ValueError
+        if name == 'gravity' and not isinstance(value, tuple):
+            value = (0, value)
+        setattr(settings, name, value)
+    return settings
+
+# ==========================================================================
+#                         SIMULATION
+# ==========================================================================
+
+def simulate(configuration: dict, ticks: int, seed: int | None = None):
+    ''' runs one configuration headless, returns its summary metrics:
+        max_height: highest position any particle reached
+        landings: number of particles that hit the ground
+        landing_histogram: landings per bin of x (LANDING_BINS bins)
+        particle_seconds: live particles summed over the simulated time
+    '''
+    settings = apply(configuration)
+    settings.seed = seed
+    game = build_headless(settings)
+    heatmap = HeatmapAccumulator(None, LANDING_BINS)  # no density needed
+    game.eruptor.heatmap = heatmap
+    max_height = 0.
+    particle_ticks = 0
+    for _ in range(ticks):
+        store = game.eruptor.store
+        if len(store):
+            max_height = max(max_height, float(store.y.max()))
+        game.tick()
+        particle_ticks += len(game.eruptor.store)
+    return {
+        'max_height': max_height,
+        'landings': len(heatmap.landing_x),
+        'landing_histogram': heatmap.landing_histogram,
+        'particle_seconds': particle_ticks / settings.physics_hz,
+    }
+
+
+def run_sweep(
+    configurations: list[dict], ticks: int, workers: int | None = None,
+    seed: int = 0
+) -> dict[str, np.ndarray]:
+    ''' simulates all configurations in parallel (workers processes,
+        None: one per core). Configuration i is seeded with seed + i.
+        returns the results as columns: one per swept field (gravity is
+        split into gravity_x and gravity_y) and one per metric
+    '''
+    seeds = range(seed, seed + len(configurations))
+    with ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(
+            simulate, configurations, itertools.repeat(ticks), seeds
+        ))
+    columns = {'seed': np.array(seeds)}
+    settings = [apply(config) for config in configurations]
+    swept = {name for config in configurations for name in config}
+    for name in sorted(swept):
+        values = [getattr(setting, name) for setting in settings]
+        if name == 'gravity':
+            columns['gravity_x'], columns['gravity_y'] = np.array(values).T
+        else:
+            columns[name] = np.array(values)
+    for metric in results[0] if results else ():
+        columns[metric] = np.array([result[metric] for result in results])
+    return columns
+
+
+def save_results(path: str, columns: dict[str, np.ndarray]):
+    ''' writes the columns to a compressed .npz file'''
+    np.savez_compressed(path, **columns)
+
+# ======================================================================
+#                           DRIVER CODE:
+# ======================================================================
+
+def _parse_fields(assignments: list[str]) -> dict[str, list[float]]:
+    ''' parses FIELD=v1,v2,... arguments'''
+    fields = {}
+    for assignment in assignments:
+        name, _, values = assignment.partition('=')
+        fields[name] = [
+            int(value) if name in INTEGER_FIELDS else float(value)
+            for value in values.split(',')
+        ]
+    return fields
+
+
+def main():
+    ''' driver code'''
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--grid', action='append', default=[],
+                        metavar='FIELD=V1,V2,...')
+    parser.add_argument('--sample', type=int, default=0,
+                        help='number of random configurations')
+    parser.add_argument('--range', action='append', default=[],
+                        metavar='FIELD=LOW,HIGH')
+    parser.add_argument('--ticks', type=int, default=2_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='sweep_results.npz')
+    arguments = parser.parse_args()
+    if arguments.sample:
+        configurations = random_sample(
+            arguments.sample, arguments.seed,
+            **_parse_fields(arguments.range)
+        )
+    else:
+        configurations = grid(**_parse_fields(arguments.grid))
+    columns = run_sweep(
+        configurations, arguments.ticks, arguments.workers, arguments.seed
+    )
+    save_results(arguments.output, columns)
+    print(f'{len(configurations)} configurations -> {arguments.output}')
+
+
+if __name__ == '__main__':
+    main()
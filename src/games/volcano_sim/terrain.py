@@ -0,0 +1,67 @@
+''' includes the Terrain class'''
+import numpy as np
+from games.volcano_sim.settings import Settings
+
+COLLISIONS = ('stop', 'bounce', 'deposit')
+
+
+class Terrain:
+    ''' the ground height (internal coords) of equally wide columns
+        across the window, -inf where there is no ground. Looking up the
+        ground under any number of particles is one indexing operation
+    '''
+    def __init__(self, heights):
+        ''' heights: ground height of every column, left to right'''
+        self._heights = np.array(heights, dtype=np.float64)
+        if self._heights.ndim != 1 or len(self._heights) == 0:
+            print('ERROR: heights must be a non-empty 1D array!')
+            raise ValueError
+
+
+    @classmethod
+    def from_settings(cls, settings: Settings):
+        ''' alternative constructor: the flat planet of planet_size, with
+            a cone of terrain_cone (height, half width) at every vent
+        '''
+        columns = settings.terrain_columns
+        centers = (np.arange(columns) + .5) / columns
+        width, height = settings.planet_size
+        on_planet = np.abs(centers - .5) <= width / 2
+        heights = np.where(on_planet, height, -np.inf)
+        if settings.terrain_cone is not None:
+            cone_height, half_width = settings.terrain_cone
+            vents = settings.vent_positions or [settings.starting_position]
+            vent_x = np.array([position[0] for position in vents])
+            distance = np.abs(centers[:, None] - vent_x).min(axis=1)
+            cone = height + cone_height * (1 - distance / half_width)
+            heights = np.where(on_planet, np.maximum(heights, cone), heights)
+        return cls(heights)
+
+
+    @property
+    def heights(self) -> np.ndarray:
+        ''' returns the ground height of every column'''
+        return self._heights
+
+
+    def columns(self, x: np.ndarray) -> np.ndarray:
+        ''' returns the column index of each x'''
+        count = len(self._heights)
+        return np.clip((x * count).astype(np.intp), 0, count - 1)
+
+
+    def height_at(self, x: np.ndarray) -> np.ndarray:
+        ''' returns the ground height under each x'''
+        return self._heights[self.columns(x)]
+
+
+    def hits(self, x: np.ndarray, y: np.ndarray, y_velocity: np.ndarray):
+        ''' returns the mask of falling particles below the ground.
+            Rising particles pass, so they can leave a vent in the ground
+        '''
+        return (y_velocity < 0) & (y < self.height_at(x))
+
+
+    def deposit(self, x: np.ndarray, amount: float):
+        ''' raises the ground under each x by amount'''
+        np.add.at(self._heights, self.columns(x), amount)
@@ -0,0 +1,79 @@
+''' closed-form trajectories of particles under constant gravity.
+    The formulas are exact for the step Volcano integrates with
+    (first v += g, then p += v), so after n steps:
+        v_n = v_0 + n * g
+        p_n = p_0 + n * v_0 + g * n * (n + 1) / 2
+'''
+import numpy as np
+
+NEVER = np.iinfo(np.int64).max  # exit step of particles that never leave
+
+
+def positions_after(
+    start: np.ndarray, velocity: np.ndarray, accel: float, steps: np.ndarray
+) -> np.ndarray:
+    ''' returns the coordinates after the given numbers of steps'''
+    return start + steps * velocity + accel * steps * (steps + 1) / 2
+
+
+def velocities_after(
+    velocity: np.ndarray, accel: float, steps: np.ndarray
+) -> np.ndarray:
+    ''' returns the velocities after the given numbers of steps'''
+    return velocity + steps * accel
+
+
+def first_exit_step(
+    start: np.ndarray, velocity: np.ndarray, accel: float,
+    lower: float | None = None, upper: float | None = None
+) -> np.ndarray:
+    ''' returns the first step (>= 1) after which the coordinate is below
+        lower or above upper (NEVER if that doesn't happen)
+    '''
+    exit_step = np.full(np.shape(start), NEVER, dtype=np.int64)
+    if lower is not None:
+        # p_n < lower  <=>  f(n) < 0
+        exit_step = np.minimum(exit_step, _first_negative_step(
+            accel / 2, velocity + accel / 2, start - lower
+        ))
+    if upper is not None:
+        # p_n > upper  <=>  -f(n) < 0
+        exit_step = np.minimum(exit_step, _first_negative_step(
+            -accel / 2, -(velocity + accel / 2), upper - start
+        ))
+    return exit_step
+
+
+def _first_negative_step(a: float, b: np.ndarray, c: np.ndarray):
+    ''' returns the smallest integer n >= 1 with a*n**2 + b*n + c < 0
+        (NEVER if there is none). a is the same for all particles
+    '''
+    b, c = np.broadcast_arrays(
+        np.asarray(b, dtype=float), np.asarray(c, dtype=float)
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if a == 0:
+            # linear: only a falling function gets negative later on
+            candidate = np.where(b < 0, np.floor(-c / b) + 1, np.inf)
+        else:
+            root = np.sqrt(b ** 2 - 4 * a * c)
+            # a < 0: negative right of the larger root, which is this one
+            # a > 0: negative between the roots, this is the smaller one
+            candidate = np.maximum(np.floor((-b - root) / (2 * a)) + 1, 1)
+            if a > 0:
+                candidate = np.where(
+                    candidate < (-b + root) / (2 * a), candidate, np.inf
+                )
+            candidate = np.where(np.isnan(candidate), np.inf, candidate)
+    candidate = np.where(a + b + c < 0, 1, np.maximum(candidate, 1))
+    finite = np.isfinite(candidate)
+    steps = np.where(finite, candidate, 0).astype(np.int64)
+    # the roots are rounded, correct them by a step where necessary:
+    for _ in range(2):
+        earlier = finite & (steps > 1) & (
+            a * (steps - 1) ** 2 + b * (steps - 1) + c < 0
+        )
+        steps = np.where(earlier, steps - 1, steps)
+        later = finite & (a * steps ** 2 + b * steps + c >= 0)
+        steps = np.where(later, steps + 1, steps)
+    return np.where(finite, steps, NEVER)
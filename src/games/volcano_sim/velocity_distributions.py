@@ -0,0 +1,56 @@
+''' random start velocities for whole expulsion batches.
+    A distribution is called as distribution(rng, spread, size) and
+    returns size deviations from the mean, scaled by spread
+'''
+import numpy as np
+
+
+def uniform(rng: np.random.Generator, spread: float, size: int):
+    ''' deviations evenly spread between -spread and spread'''
+    return rng.uniform(-spread, spread, size)
+
+
+def normal(rng: np.random.Generator, spread: float, size: int):
+    ''' normally distributed deviations, spread is the standard deviation'''
+    return rng.normal(0, spread, size)
+
+
+def truncated_normal(rng: np.random.Generator, spread: float, size: int):
+    ''' normally distributed deviations with standard deviation spread / 2,
+        redrawn until all lie between -spread and spread
+    '''
+    deviations = rng.normal(0, spread / 2, size)
+    outside = np.abs(deviations) > spread
+    while outside.any():
+        deviations[outside] = rng.normal(0, spread / 2, outside.sum())
+        outside = np.abs(deviations) > spread
+    return deviations
+
+
+DISTRIBUTIONS = {
+    'uniform': uniform,
+    'normal': normal,
+    'truncated': truncated_normal,
+}
+
+
+def get_distribution(name: str):
+    ''' returns the distribution function for a name in DISTRIBUTIONS'''
+    if name not in DISTRIBUTIONS:
+        print(f'ERROR: distribution must be one of '
+              f'{", ".join(DISTRIBUTIONS)}!')
+        raise ValueError
+    return DISTRIBUTIONS[name]
+
+
+def sample_velocities(
+    rng: np.random.Generator, number: int, speed: float,
+    speed_spread: float, angle_spread: float, distribution=uniform
+) -> tuple[np.ndarray, np.ndarray]:
+    ''' returns the velocities (vx, vy) of number particles, with random
+        speeds around speed and angles (in degrees) around straight up.
+        Like Particle._determine_velocity, vy is never negative
+    '''
+    speeds = speed + distribution(rng, speed_spread, number)
+    angles = np.radians(distribution(rng, angle_spread, number))
+    return speeds * np.sin(angles), np.abs(speeds * np.cos(angles))
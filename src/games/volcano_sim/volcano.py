@@ -1,10 +1,24 @@
 ''' includes Volcano and Expulsable classes'''
 from abc import ABC
 from abc import abstractmethod
+import copy
+import heapq
+import numpy as np
 from games.volcano_sim.settings import Settings
 from games.volcano_sim.coord_converter import CoordConverter
 from games.volcano_sim.planet import Eruptor
-from games.volcano_sim.particle import Particle
+from games.volcano_sim.particle import Particle, ParticleView
+from games.volcano_sim.particle_store import ParticleStore
+from games.volcano_sim import trajectories
+from games.volcano_sim.integrators import get_integrator, integrate
+from games.volcano_sim.terrain import COLLISIONS, Terrain
+from games.volcano_sim.spatial_grid import SpatialGrid
+from games.volcano_sim.velocity_distributions import (
+    get_distribution, sample_velocities
+)
+from games.volcano_sim.eruption_scheduler import (
+    EruptionProfile, EruptionScheduler, PeriodicEruption
+)
 
 class Expulsable(ABC):
     ''' abstract base class to determine particles'''
@@ -34,23 +48,62 @@ class Expulsable(ABC):
 
 class Volcano(CoordConverter, Eruptor):
     ''' class to manage the volcano emissions created in the simulation'''
+    _columns = {}  # extra per-particle arrays of the store (name: dtype)
+
     def __init__(
             self, settings: Settings, default_particle: Particle,
+            profiles: list[EruptionProfile] | None = None,
+            rng: np.random.Generator | None = None,
     ):
-        ''' generate the volcano class to manage the particles'''
+        ''' generate the volcano class to manage the particles.
+            profiles: when to erupt, by default periodically as in settings
+            rng: draws the start velocities (default: seeded with
+            settings.seed)
+        '''
         super().__init__(settings)
-        self._particles = []
+        self._store = ParticleStore(
+            settings.particle_capacity, settings.max_particles, self._columns
+        )
         self._gravity = settings.gravity
-        self._eruption_timer = 0
+        self._integrator = get_integrator(settings.integrator)
+        if not isinstance(settings.substeps, int) or settings.substeps <= 0:
+            print('ERROR: substeps must be positive integer!')
+            raise ValueError
+        self._substeps = settings.substeps
+        if settings.collision is None:
+            self._terrain = None
+        elif settings.collision in COLLISIONS:
+            self._terrain = Terrain.from_settings(settings)
+        else:
+            print(f'ERROR: collision must be None or one of '
+                  f'{", ".join(COLLISIONS)}!')
+            raise ValueError
+        self._collision = settings.collision
+        self._restitution = settings.restitution
+        self._deposit_height = settings.deposit_height
+        self._interaction_radius = settings.interaction_radius
+        self._interaction_strength = settings.interaction_strength
+        if settings.interaction_radius is None:
+            self._grid = None
+        else:
+            self._grid = SpatialGrid(settings.interaction_radius)
+        self._pairs = None  # close pairs of the current tick
+        self._tick = 0
+        self._physics_hz = settings.physics_hz
         self._concurrent_expulsions = settings.concurrent_expulsions
-        self._eruption_properties = {
-            'frequency': settings.eruption_frequency,
-            'downtime': settings.eruption_downtime,
-            'duration': settings.eruption_time,
-            'last_erupt': -1
-        }
-        self._eruption_frequency = 2  # every second frame
+        if profiles is None:
+            profiles = [PeriodicEruption(
+                settings.eruption_time, settings.eruption_downtime,
+                interval=settings.eruption_frequency
+            )]
+        self._scheduler = EruptionScheduler(profiles)
         self._default_particle = default_particle
+        if rng is None:
+            rng = np.random.default_rng(settings.seed)
+        self._rng = rng
+        self._recorder = None  # see recording.Recorder
+        self._heatmap = None  # see heatmap.HeatmapAccumulator
+        self._distribution = get_distribution(settings.velocity_distribution)
         if settings.randomness:
             self._random_attributes = {
                 'randomness': True,
@@ -61,14 +114,109 @@ class Volcano(CoordConverter, Eruptor):
         else:
             self._random_attributes = {'randomness': False}
 
+    @property
+    def store(self):
+        ''' returns the array-backed storage of the live particles'''
+        return self._store
+
+
+    @property
+    def tick(self) -> int:
+        ''' returns the number of simulated ticks'''
+        return self._tick
+
+
+    @property
+    def rng(self) -> np.random.Generator:
+        ''' returns the generator the start velocities are drawn from'''
+        return self._rng
+
+
+    @property
+    def recorder(self):
+        ''' returns the recorder the run is streamed to (or None)'''
+        return self._recorder
+
+
+    @recorder.setter
+    def recorder(self, recorder):
+        ''' sets a recorder (None: stop recording)'''
+        self._recorder = recorder
+
+
+    @property
+    def terrain(self) -> Terrain | None:
+        ''' returns the ground the particles collide with (None: they
+            only leave through the window borders)
+        '''
+        return self._terrain
+
+
+    @property
+    def grid(self) -> SpatialGrid | None:
+        ''' returns the spatial grid of the particles, rebuilt every tick
+            (None: particles don't interact)
+        '''
+        return self._grid
+
+
+    @property
+    def heatmap(self):
+        ''' returns the accumulator of densities and landings (or None)'''
+        return self._heatmap
+
+
+    @heatmap.setter
+    def heatmap(self, heatmap):
+        ''' sets an accumulator (None: stop accumulating)'''
+        self._heatmap = heatmap
+
+
+    @property
+    def scheduler(self) -> EruptionScheduler:
+        ''' returns the scheduler deciding when the volcano erupts'''
+        return self._scheduler
+
+
+    @property
+    def default_particle(self):
+        ''' returns the particle all emitted particles are based on'''
+        return self._default_particle
+
+
+    @property
+    def templates(self) -> list[Particle]:
+        ''' returns the particles the emitted ones look like'''
+        return [self._default_particle]
+
+
+    def template_indices(self) -> np.ndarray | None:
+        ''' returns the index into templates of every live particle
+            (None: all look like the first)
+        '''
+        return None
+
+
     @property
     def particles(self):
-        return self._particles
+        ''' returns read-only views of the live particles'''
+        store = self.store
+        templates, indices = self.templates, self.template_indices()
+        if indices is None:
+            indices = np.zeros(len(store), dtype=np.intp)
+        return [
+            ParticleView(store, index, templates[template])
+            for index, template in enumerate(indices.tolist())
+        ]
 
     @particles.setter
     def particles(self, new_value):
         if isinstance(new_value, list):
-            self._particles = new_value
+            self._store.clear()
+            for particle in new_value:
+                x, y = particle.position
+                x_velocity, y_velocity = particle.velocity
+                self._spawn(x, y, x_velocity, y_velocity)
         else:
             print('particles must be list of Particle objects!')
             raise ValueError
@@ -97,113 +245,582 @@ class Volcano(CoordConverter, Eruptor):
 
 
     def erupt(self):
-        ''' manages particle creation, respecting the eruption frequency
-            eruption_properties: frequency, downtime, duration, and last_erupt
-        '''
-        if (self._eruption_timer >= 0
-            and self._eruption_timer < self._eruption_properties['duration']):
-            if self._determine_if_erupts(
-                self._eruption_timer,
-                self._eruption_properties['last_erupt'],
-                self._eruption_properties['frequency']
-            ):
-                self.single_expulsion()
-            self._eruption_timer += 1
-        elif self._eruption_timer >= self._eruption_properties['duration']:
-            self._eruption_timer = -1
-        elif (self._eruption_timer < 0
-            and self._eruption_timer > -1*self._eruption_properties['downtime']
-        ):
-            # using negative int numbers as wait time
-            self._eruption_properties['last_erupt'] = self._eruption_timer
-            self._eruption_timer -= 1
-        elif self._eruption_timer <= self._eruption_properties['downtime']:
-            self._eruption_timer = 0
-        else:
-            print('This shouldn\'t happen!')
-            raise AssertionError
-
-
-    def _erupt2(self):
-        ''' keep erupting over a short timeframe, then stop to recover'''
-        if self._eruption_timer >= 0:
-            if self._eruption_timer < self._eruption_properties['duration']:
-                triggers_eruption = (
-                    round(self._eruption_timer / self._eruption_properties[
-                        'frequency'
-                    ])
-                    != self._eruption_properties['last_erupt']
-                )
-                if triggers_eruption:
-                    self.erupt()
-                    self._eruption_properties[
-                        'last_erupt'
-                    ] = self._eruption_timer
-                self._eruption_timer += 1
-            else:
-                self._eruption_timer = -1
-        else:
-            if (self._eruption_timer
-                >= -1 * self._eruption_properties['downtime']):
-                self._eruption_timer -= 1
-            else:
-                self._eruption_timer = 0
-
-
-    def single_expulsion(self):
-        ''' defines a single expulsion event during an eruption'''
-        for _ in range(self.concurrent_expulsions):
-            if self._random_attributes['randomness']:
-                self.particles.append(
-                    Particle.like_particle(
-                        self._default_particle,
-                        self._random_attributes['avg_velocity'],
-                        self._random_attributes['velocity_spread'],
-                        self._random_attributes['angle_spread'],
-                    )
-                )
+        ''' expels the particles the eruption profiles schedule for the
+            current tick, all in one batch
+        '''
+        expulsions = self._scheduler.due(self._tick)
+        if expulsions:
+            self.single_expulsion(expulsions * self.concurrent_expulsions)
+
+
+    def advance(self, ticks: int) -> int:
+        ''' simulates ticks without rendering, in the order of the main
+            loop (cull, erupt, step). Ticks without eruption are skipped
+            at once where possible. returns the number of ticks advanced
+        '''
+        remaining = ticks
+        while remaining > 0:
+            idle = min(self._idle_ticks(), remaining)
+            if idle and self._can_skip_idle():
+                self._skip_idle(idle)
+                remaining -= idle
             else:
-                self.particles.append(
-                    Particle.like_particle(self._default_particle)
-                )
+                self.destroy_out_of_bounds()
+                self.erupt()
+                self.step()
+                remaining -= 1
+        return ticks
 
 
-    def _determine_if_erupts(
-            self, current_time: int, last_erupt_time: int, frequency: float
-    ):
-        return (current_time // frequency
-                    != last_erupt_time)
+    def advance_seconds(self, seconds: float) -> int:
+        ''' simulates the given time (at physics_hz ticks per second)'''
+        return self.advance(round(seconds * self._physics_hz))
+
+
+    def skip_to_next_eruption(self) -> int:
+        ''' advances until the next eruption starts. During an eruption,
+            that is the one after it. returns the ticks advanced
+        '''
+        start = self._scheduler.next_start(self._tick + 1)
+        if start is None:
+            return 0
+        return self.advance(start - self._tick)
+
+
+    def _idle_ticks(self) -> int:
+        ''' returns the number of upcoming ticks without emission'''
+        next_tick = self._scheduler.next_tick
+        if next_tick is None:
+            return trajectories.NEVER
+        return max(next_tick - self._tick, 0)
+
+
+    def _can_skip_idle(self) -> bool:
+        ''' only an empty volcano can skip ticks, nothing has to move.
+            Not while every tick is recorded or accumulated
+        '''
+        return len(self._store) == 0 and not self._observes_every_tick()
+
+
+    def _observes_every_tick(self) -> bool:
+        ''' returns True if a 'states' recorder or the heatmap needs
+            every tick
+        '''
+        if self._heatmap is not None:
+            return True
+        return self._recorder is not None and self._recorder.mode == 'states'
+
+
+    def _skip_idle(self, ticks: int):
+        ''' skips ticks without eruption (at most _idle_ticks)'''
+        self._tick += ticks
+
+
+    def single_expulsion(self, number: int | None = None) -> int:
+        ''' expels number particles at once (default:
+            concurrent_expulsions), returns how many were added
+        '''
+        if number is None:
+            number = self.concurrent_expulsions
+        x_velocity, y_velocity = self.start_velocities(number)
+        x, y = self._default_particle.position
+        return self._spawn(x, y, x_velocity, y_velocity)
+
+
+    def start_velocities(self, number: int) -> tuple[np.ndarray, np.ndarray]:
+        ''' returns the velocities (vx, vy) of number new particles, drawn
+            in one batch if randomness is on
+        '''
+        if self._random_attributes['randomness']:
+            return sample_velocities(
+                self._rng, number,
+                self._random_attributes['avg_velocity'],
+                self._random_attributes['velocity_spread'],
+                self._random_attributes['angle_spread'],
+                self._distribution
+            )
+        x_velocity, y_velocity = self._default_particle.velocity
+        return np.full(number, x_velocity), np.full(number, y_velocity)
+
+
+    def _spawn(self, x, y, x_velocity, y_velocity) -> int:
+        ''' adds particles to the store, returns how many were added'''
+        first_new = len(self._store)
+        number = self._store.spawn(x, y, x_velocity, y_velocity)
+        self.update_pixel_centers(first_new)
+        self._record_spawn(first_new, number)
+        return number
+
+
+    def _record_spawn(self, first_new: int, number: int):
+        ''' passes the new particles to the recorder, if any'''
+        if self._recorder is not None and number:
+            store, new = self._store, slice(first_new, first_new + number)
+            self._recorder.record_spawn(
+                self._tick, store.x[new], store.y[new],
+                store.vx[new], store.vy[new]
+            )
+
+
+    def _record_state(self):
+        ''' passes the positions after a tick to a 'states' recorder and
+            to the heatmap
+        '''
+        if self._recorder is not None and self._recorder.mode == 'states':
+            store = self.store
+            self._recorder.record_state(self._tick, store.x, store.y)
+        if self._heatmap is not None:
+            store = self.store
+            self._heatmap.accumulate(store.x, store.y)
+
+
+    def step(self):
+        ''' advances all particles by one tick in a single batched pass:
+            integrates their motion (with the integrator and substeps
+            from the settings) and converts the new positions to pixel
+            centers
+        '''
+        store = self._store
+        if self._grid is not None:
+            self._grid.build(store.x, store.y)
+            self._pairs = self._grid.pairs(
+                store.x, store.y, self._interaction_radius
+            )
+        integrate(
+            store.x, store.y, store.vx, store.vy,
+            self.acceleration, self._integrator, self._substeps
+        )
+        age = store.age
+        age += 1
+        self.update_pixel_centers()
+        self._tick += 1
+        self._record_state()
+
+
+    def acceleration(self, x, y, x_velocity, y_velocity):
+        ''' returns the acceleration of the particles: gravity, plus the
+            forces between the close pairs found at the start of the tick
+        '''
+        if self._pairs is None:
+            return self.gravity
+        x_accel, y_accel = self.pair_forces(x, y, *self._pairs)
+        return self._gravity[0] + x_accel, self._gravity[1] + y_accel
+
+
+    def pair_forces(self, x, y, first, second):
+        ''' returns the accelerations (ax, ay) from the pairs: a linear
+            spring over the interaction_radius, pushing apart (positive
+            strength, collisions) or pulling together (negative strength,
+            agglomeration)
+        '''
+        x_distance = x[first] - x[second]
+        y_distance = y[first] - y[second]
+        distance = np.maximum(np.hypot(x_distance, y_distance), 1e-12)
+        push = self._interaction_strength \
+            * (1 - distance / self._interaction_radius) / distance
+        accels = []
+        for component in (x_distance * push, y_distance * push):
+            accels.append(
+                np.bincount(first, component, minlength=len(x))
+                - np.bincount(second, component, minlength=len(x))
+            )
+        return tuple(accels)
 
 
     def update_particle_velocities(self):
         ''' updates the velocities of all current particles'''
-        if self.particles:
-            for particle in self.particles:
-                particle.update_velocity(self.gravity)
+        x_accel, y_accel = self.gravity
+        x_velocity, y_velocity = self._store.vx, self._store.vy
+        x_velocity += x_accel
+        y_velocity += y_accel
 
 
     def update_particle_positions(self):
-        ''' updates the positions and rects/ boxes of the particles'''
-        if self.particles:
-            for particle in self.particles:
-                particle.update_position()
+        ''' updates the positions (and pixel centers) of the particles'''
+        x, y, age = self._store.x, self._store.y, self._store.age
+        x += self._store.vx
+        y += self._store.vy
+        age += 1
+        self.update_pixel_centers()
 
 
     def update_particle_movements(self):
         ''' calculate the speeds at which the particles move'''
-        for particle in self.particles:
-            particle.update_position()
-            particle.update_velocity(
-                self.gravity
+        self.update_particle_positions()
+        self.update_particle_velocities()
+
+
+    def update_pixel_centers(self, start: int = 0):
+        ''' converts the positions of the particles from index start on
+            to pixel coordinates (see CoordConverter)
+        '''
+        self.convert_internal_arrays_to_px(
+            self._store.x[start:], self._store.y[start:],
+            out=(self._store.px[start:], self._store.py[start:])
+        )
+
+
+    def destroy_out_of_bounds(self, ):
+        '''determine whether particles are out of bounds, then destroy them.
+            With a terrain, particles hitting the ground are handled first
+        '''
+        if self._terrain is not None:
+            self._collide()
+        x, y, alive = self._store.x, self._store.y, self._store.alive
+        inside = (y >= 0) & (x >= 0) & (x <= 1)
+        if self._heatmap is not None:
+            # particles that hit the ground are recorded already:
+            self._heatmap.record_landings(
+                x[(y < 0) & (x >= 0) & (x <= 1) & alive]
             )
+        alive &= inside
+        self._store.compact()
+
+
+    def _collide(self):
+        ''' applies the collision response to all particles that fell
+            below the ground: 'stop' removes them, 'deposit' also raises
+            the ground, 'bounce' reflects them (keeping restitution of the
+            vertical speed) and removes those too slow to lift off again
+        '''
+        store = self._store
+        slots = np.flatnonzero(self._terrain.hits(store.x, store.y, store.vy))
+        if len(slots) == 0:
+            return
+        if self._collision == 'bounce':
+            store.y[slots] = self._terrain.height_at(store.x[slots])
+            store.vy[slots] *= -self._restitution
+            store.px[slots], store.py[slots] = \
+                self.convert_internal_arrays_to_px(
+                    store.x[slots], store.y[slots]
+                )
+            # it would be below the ground again after the next tick:
+            slots = slots[store.vy[slots] <= abs(self._gravity[1])]
+        landed = store.x[slots]
+        if self._heatmap is not None:
+            self._heatmap.record_landings(landed)
+        if self._collision == 'deposit':
+            self._terrain.deposit(landed, self._deposit_height)
+        store.alive[slots] = False
+
+
+class AnalyticVolcano(Volcano):
+    ''' volcano that doesn't integrate the particles step by step (it
+        always follows the 'euler' integrator without substeps). Each
+        particle only keeps its launch tick, origin and initial velocity,
+        the positions are calculated in closed form (see trajectories)
+        when the store is read. The tick a particle leaves the window is
+        known at launch, so culling pops a priority queue
+    '''
+    _columns = {
+        'uid': np.int64,  # increasing, so it stays sorted in the store
+        'launch': np.int64,
+        'x0': np.float64,
+        'y0': np.float64,
+        'vx0': np.float64,
+        'vy0': np.float64,
+    }
+
+    def __init__(
+            self, settings: Settings, default_particle: Particle,
+            profiles: list[EruptionProfile] | None = None,
+            rng: np.random.Generator | None = None,
+    ):
+        ''' generate the volcano with an empty exit queue'''
+        if (settings.collision is not None
+                or settings.interaction_radius is not None):
+            print('ERROR: AnalyticVolcano supports no collisions or '
+                  'interactions!')
+            raise ValueError
+        if settings.integrator != 'euler' or settings.substeps != 1:
+            print('ERROR: AnalyticVolcano follows the \'euler\' integrator '
+                  'without substeps!')
+            raise ValueError
+        super().__init__(settings, default_particle, profiles, rng)
+        self._next_uid = 0
+        self._exits = []  # heap of (exit tick, uid)
+        self._evaluated_tick = 0
+
+
+    @property
+    def store(self):
+        ''' returns the store with positions evaluated for the current
+            tick
+        '''
+        if self._evaluated_tick != self._tick:
+            self._evaluate()
+        return self._store
+
+
+    def step(self):
+        ''' advances all particles by one tick (no per-particle work)'''
+        self._tick += 1
+        self._record_state()
+
+
+    def seek(self, tick: int):
+        ''' jumps the particles forward to tick in O(1), no eruptions
+            happen in between (emissions scheduled there are dropped).
+            Left particles are removed by the next destroy_out_of_bounds
+        '''
+        if tick < self._tick:
+            print('ERROR: can only seek forward!')
+            raise ValueError
+        if tick > self._tick:
+            self._scheduler.skip_to(tick)
+        self._tick = tick
+
+
+    def _can_skip_idle(self) -> bool:
+        ''' the particles move in closed form, idle ticks can be skipped
+            unless every tick is recorded or accumulated
+        '''
+        return not self._observes_every_tick()
+
+
+    def _skip_idle(self, ticks: int):
+        ''' skips ticks without eruption, culling like the last of them'''
+        self.seek(self._tick + ticks - 1)
+        self.destroy_out_of_bounds()
+        self.step()
+
+
+    def update_particle_velocities(self):
+        ''' nothing to do, velocities follow from the tick'''
+
+
+    def update_particle_positions(self):
+        ''' advances all particles by one tick'''
+        self.step()
+
+
+    def update_pixel_centers(self, start: int = 0):
+        ''' evaluates the positions (and pixel centers) of all particles'''
+        self._evaluate()
 
 
     def destroy_out_of_bounds(self, ):
-        '''determine whether particles are out of bounds, then destroy them'''
-        for particle in self.particles:
-            x_position, y_position = particle.position
-            is_below_screen = y_position < 0
-            too_far_left = x_position < 0
-            too_far_right = x_position > 1
-            if is_below_screen or too_far_left or too_far_right:
-                self.particles.remove(particle)
+        ''' removes the particles whose exit tick has been reached'''
+        expired = []
+        while self._exits and self._exits[0][0] <= self._tick:
+            expired.append(heapq.heappop(self._exits))
+        if expired:
+            exit_ticks, expired = np.array(expired).T
+            uid = self._store.column('uid')
+            slots = np.searchsorted(uid, expired)
+            # the queue can outlive particles removed otherwise (clear):
+            valid = slots < len(uid)
+            valid[valid] = uid[slots[valid]] == expired[valid]
+            slots, exit_ticks = slots[valid], exit_ticks[valid]
+            if self._heatmap is not None:
+                self._record_landings(slots, exit_ticks)
+            self._store.alive[slots] = False
+            self._store.compact()
+
+
+    def _record_landings(self, slots: np.ndarray, exit_ticks: np.ndarray):
+        ''' passes the particles at slots that leave through the ground to
+            the heatmap, with their positions at their exit ticks
+        '''
+        store = self._store
+        steps = exit_ticks - store.column('launch')[slots]
+        x_accel, y_accel = self.gravity
+        x = trajectories.positions_after(
+            store.column('x0')[slots], store.column('vx0')[slots],
+            x_accel, steps
+        )
+        y = trajectories.positions_after(
+            store.column('y0')[slots], store.column('vy0')[slots],
+            y_accel, steps
+        )
+        self._heatmap.record_landings(x[(y < 0) & (x >= 0) & (x <= 1)])
+
+
+    def _spawn(self, x, y, x_velocity, y_velocity) -> int:
+        ''' adds particles launched at the current tick and queues their
+            exit ticks
+        '''
+        first_new = len(self._store)
+        number = self._store.spawn(x, y, x_velocity, y_velocity)
+        store = self._store
+        new = slice(first_new, first_new + number)
+        uids = np.arange(self._next_uid, self._next_uid + number)
+        self._next_uid += number
+        store.column('uid')[new] = uids
+        store.column('launch')[new] = self._tick
+        x0, y0 = store.column('x0')[new], store.column('y0')[new]
+        vx0, vy0 = store.column('vx0')[new], store.column('vy0')[new]
+        x0[:], y0[:] = store.x[new], store.y[new]
+        vx0[:], vy0[:] = store.vx[new], store.vy[new]
+        x_accel, y_accel = self.gravity
+        exits = np.minimum(
+            trajectories.first_exit_step(x0, vx0, x_accel, 0, 1),
+            trajectories.first_exit_step(y0, vy0, y_accel, lower=0)
+        )
+        for exit_step, uid in zip(exits.tolist(), uids.tolist()):
+            if exit_step != trajectories.NEVER:
+                heapq.heappush(self._exits, (self._tick + exit_step, uid))
+        # new particles sit at their origin, the others are still valid:
+        super().update_pixel_centers(first_new)
+        self._record_spawn(first_new, number)
+        return number
+
+
+    def _evaluate(self):
+        ''' calculates positions, velocities and pixel centers of all
+            particles for the current tick
+        '''
+        store = self._store
+        x_accel, y_accel = self.gravity
+        steps = self._tick - store.column('launch')
+        store.x[:] = trajectories.positions_after(
+            store.column('x0'), store.column('vx0'), x_accel, steps
+        )
+        store.y[:] = trajectories.positions_after(
+            store.column('y0'), store.column('vy0'), y_accel, steps
+        )
+        store.vx[:] = trajectories.velocities_after(
+            store.column('vx0'), x_accel, steps
+        )
+        store.vy[:] = trajectories.velocities_after(
+            store.column('vy0'), y_accel, steps
+        )
+        store.age[:] = steps
+        super().update_pixel_centers()
+        self._evaluated_tick = self._tick
+
+
+class VolcanicField(Volcano):
+    ''' several vents erupting into one shared store. Each vent is a
+        Volcano with its own position (that of its default_particle),
+        eruption profiles and particle template, but the field only asks
+        it for start velocities: all particles move, collide, are culled
+        and drawn in single batched passes, whatever the number of vents.
+        The vent of every particle is kept in the 'vent' column
+    '''
+    _columns = {'vent': np.intp}
+
+    def __init__(
+            self, settings: Settings, vents: list[Volcano],
+            rng: np.random.Generator | None = None,
+    ):
+        ''' generate the field, scheduling the profiles of all vents
+            together. The vents keep their own rng and velocity settings
+        '''
+        if not vents:
+            print('ERROR: a VolcanicField needs at least one vent!')
+            raise ValueError
+        if settings.analytic_trajectories:
+            print('ERROR: a VolcanicField integrates its particles, it '
+                  'supports no analytic_trajectories!')
+            raise ValueError
+        profiles, owners = [], []
+        for index, vent in enumerate(vents):
+            profiles.extend(vent.scheduler.profiles)
+            owners.extend([index] * len(vent.scheduler.profiles))
+        super().__init__(settings, vents[0].default_particle, profiles, rng)
+        self._vents = list(vents)
+        self._owners = owners  # vent of each scheduled profile
+
+
+    @classmethod
+    def from_positions(
+            cls, settings: Settings, positions: list[tuple[float, float]],
+            colors: list | None = None
+    ):
+        ''' alternative constructor: one vent like the settings describe
+            at each position (internal coords), optionally with its own
+            particle color. The vents are seeded from settings.seed.
+            They only draw start velocities, so they get a single store
+            slot and no terrain or grid: the field's are shared
+        '''
+        if colors is None:
+            colors = [settings.particle_color] * len(positions)
+        if len(colors) != len(positions):
+            print('ERROR: need one color per vent position!')
+            raise ValueError
+        seeds = np.random.SeedSequence(settings.seed).spawn(len(positions))
+        vents = []
+        for position, color, seed in zip(positions, colors, seeds):
+            vent_settings = copy.copy(settings)
+            vent_settings.starting_position = tuple(position)
+            vent_settings.particle_color = color
+            vent_settings.particle_capacity = 1
+            vent_settings.max_particles = None
+            vent_settings.collision = None
+            vent_settings.interaction_radius = None
+            vents.append(Volcano(
+                vent_settings, Particle(vent_settings),
+                rng=np.random.default_rng(seed)
+            ))
+        return cls(settings, vents)
+
+
+    @property
+    def vents(self) -> list[Volcano]:
+        ''' returns the vents of the field'''
+        return self._vents
+
+
+    @property
+    def templates(self) -> list[Particle]:
+        ''' returns the particle template of every vent'''
+        return [vent.default_particle for vent in self._vents]
+
+
+    def template_indices(self) -> np.ndarray:
+        ''' returns the vent of every live particle'''
+        return self._store.column('vent')
+
+
+    def erupt(self):
+        ''' expels the particles all vents schedule for the current tick,
+            all in one batch
+        '''
+        emissions = self._scheduler.pop_due(self._tick)
+        if emissions:
+            numbers = np.zeros(len(self._vents), dtype=np.int64)
+            for index, expulsions in emissions:
+                numbers[self._owners[index]] += expulsions
+            self.expel(numbers * [
+                vent.concurrent_expulsions for vent in self._vents
+            ])
+
+
+    def single_expulsion(self, number: int | None = None) -> int:
+        ''' expels number particles from every vent at once (default:
+            their concurrent_expulsions), returns how many were added
+        '''
+        if number is None:
+            numbers = [vent.concurrent_expulsions for vent in self._vents]
+        else:
+            numbers = [number] * len(self._vents)
+        return self.expel(numbers)
+
+
+    def expel(self, numbers) -> int:
+        ''' expels numbers[i] particles from vent i, spawned together.
+            returns how many were added
+        '''
+        numbers = np.asarray(numbers, dtype=np.int64)
+        if len(numbers) != len(self._vents):
+            print('ERROR: need one number per vent!')
+            raise ValueError
+        erupting = np.flatnonzero(numbers > 0)
+        if len(erupting) == 0:
+            return 0
+        positions, velocities = [], []
+        for index in erupting.tolist():
+            vent = self._vents[index]
+            velocities.append(vent.start_velocities(int(numbers[index])))
+            positions.append(vent.default_particle.position)
+        x_velocity, y_velocity = (
+            np.concatenate(component) for component in zip(*velocities)
+        )
+        x, y = np.repeat(np.array(positions), numbers[erupting], axis=0).T
+        first_new = len(self._store)
+        number = self._spawn(x, y, x_velocity, y_velocity)
+        # the store drops the last particles when it is full:
+        self._store.column('vent')[first_new:first_new + number] = \
+            np.repeat(erupting, numbers[erupting])[:number]
+        return number
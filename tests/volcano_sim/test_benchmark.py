@@ -0,0 +1,45 @@
+''' tests the benchmark runner '''
+
+import games.volcano_sim.benchmark as b
+
+
+class TestBenchmark:
+    ''' tests the benchmark functions with tiny particle numbers'''
+    def test_run_benchmarks(self):
+        ''' tests that every case runs and reports its throughput'''
+        results = b.run_benchmarks(sizes=(10, 20), repeats=1)
+        names = {result['benchmark'] for result in results}
+        assert names == set(b.cases(b.Bench(1)))
+        assert len(results) == 2 * len(names)
+        for result in results:
+            assert result['seconds'] >= 0
+
+
+    def test_erupt_spawns(self):
+        ''' tests that every repeat of the erupt case creates all
+            particles (the fastest repeat is reported)
+        '''
+        bench = b.Bench(50)
+        setup, erupt = b.cases(bench)['erupt']
+        for _ in range(3):
+            setup()
+            erupt()
+            assert len(bench.volcano.store) == 50
+
+
+    def test_only(self):
+        ''' tests the selection of cases'''
+        results = b.run_benchmarks(sizes=(10,), repeats=1, names=['step'])
+        assert [result['benchmark'] for result in results] == ['step']
+
+
+    def test_compare(self):
+        ''' tests the speedup lines against an earlier run'''
+        old = [{'benchmark': 'step', 'particles': 10, 'seconds': 2.}]
+        new = [
+            {'benchmark': 'step', 'particles': 10, 'seconds': 1.},
+            {'benchmark': 'erupt', 'particles': 10, 'seconds': 1.},
+        ]
+        lines = b.compare(new, old)
+        assert len(lines) == 1
+        assert lines[0].endswith('2.00x')
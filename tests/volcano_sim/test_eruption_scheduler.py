@@ -0,0 +1,106 @@
+''' tests the eruption profiles and the scheduler '''
+
+import numpy as np
+import pytest
+import games.volcano_sim.eruption_scheduler as es
+
+
+def emissions(scheduler, ticks):
+    ''' returns {tick: expulsions} of all emissions before ticks'''
+    result = {}
+    for tick in range(ticks):
+        expulsions = scheduler.due(tick)
+        if expulsions:
+            result[tick] = expulsions
+    return result
+
+
+class TestProfiles:
+    ''' tests the timing of the single profiles'''
+    def test_periodic(self):
+        ''' tests duration, interval and downtime'''
+        profile = es.PeriodicEruption(5, 3, expulsions=2, interval=2)
+        scheduler = es.EruptionScheduler([profile])
+        assert emissions(scheduler, 16) == {
+            0: 2, 2: 2, 4: 2, 8: 2, 10: 2, 12: 2
+        }
+        assert profile.next_start(1) == 8
+        assert profile.next_start(8) == 8
+
+
+    def test_start(self):
+        ''' tests that nothing happens before the start tick'''
+        profile = es.PeriodicEruption(1, 1, start=3)
+        assert profile.next_emission(0) == (3, 1)
+
+
+    def test_decaying(self):
+        ''' tests the exponential decay within each eruption'''
+        profile = es.DecayingEruption(3, 2, expulsions=8, decay=.5)
+        scheduler = es.EruptionScheduler([profile])
+        assert emissions(scheduler, 8) == {0: 8, 1: 4, 2: 2, 5: 8, 6: 4, 7: 2}
+
+
+    def test_poisson(self):
+        ''' tests the mean rate and that next_start agrees with it'''
+        profile = es.PoissonEruption(.1, rng=np.random.default_rng(0))
+        scheduler = es.EruptionScheduler([profile])
+        start = scheduler.next_start(0)
+        assert scheduler.next_tick == start
+        assert len(emissions(scheduler, 20_000)) == pytest.approx(
+            2_000, rel=.1
+        )
+
+
+    @pytest.mark.parametrize('arguments', [(0, 1), (1, -1), (1, 1, -1)])
+    def test_invalid(self, arguments):
+        ''' tests the validation of the arguments'''
+        with pytest.raises(ValueError):
+            es.PeriodicEruption(*arguments)
+
+
+class TestEruptionScheduler:
+    ''' tests combining profiles'''
+    def test_overlapping(self):
+        ''' tests that simultaneous emissions are summed up'''
+        scheduler = es.EruptionScheduler([
+            es.PeriodicEruption(2, 2),
+            es.PeriodicEruption(1, 2, expulsions=10),
+        ])
+        assert emissions(scheduler, 7) == {0: 11, 1: 1, 3: 10, 4: 1, 5: 1,
+                                           6: 10}
+        assert scheduler.next_start(7) == 8
+
+
+    def test_due_catches_up(self):
+        ''' tests that late calls expel everything missed at once'''
+        scheduler = es.EruptionScheduler([es.PeriodicEruption(3, 1)])
+        assert scheduler.due(5) == 5
+        assert scheduler.next_tick == 6
+
+
+    def test_pop_due(self):
+        ''' tests that due emissions are reported per profile'''
+        scheduler = es.EruptionScheduler([
+            es.PeriodicEruption(1, 1, expulsions=2),
+            es.PeriodicEruption(1, 2, expulsions=3),
+        ])
+        assert sorted(scheduler.pop_due(2)) == [(0, 2), (0, 2), (1, 3)]
+        assert scheduler.pop_due(2) == []
+
+
+    def test_skip_to(self):
+        ''' tests that skipped emissions are dropped'''
+        scheduler = es.EruptionScheduler([es.PeriodicEruption(3, 1)])
+        scheduler.skip_to(5)
+        assert scheduler.next_tick == 5
+        assert scheduler.due(5) == 1
+
+
+    def test_add(self):
+        ''' tests adding a profile later on'''
+        scheduler = es.EruptionScheduler([])
+        assert scheduler.next_tick is None
+        assert scheduler.next_start(0) is None
+        scheduler.add(es.PeriodicEruption(1, 4), 3)
+        assert scheduler.next_tick == 5
@@ -0,0 +1,61 @@
+''' tests the headless engine '''
+
+import pytest
+import pygame
+import games.volcano_sim.settings as s
+import games.volcano_sim.headless as h
+import games.volcano_sim.volcano as v
+
+
+class TestHeadlessGame:
+    ''' tests the class HeadlessGame'''
+    def test_physics_only(self):
+        ''' tests that the simulation runs without any display or font'''
+        pygame.quit()  # undo the initialisation of earlier tests
+        game = h.build_headless(s.Settings())
+        game.run(30)
+        assert game.ticks == 30
+        assert len(game.eruptor.store) == 20
+        assert game.frame is None
+        assert not pygame.display.get_init()
+        assert not pygame.font.get_init()
+        with pytest.raises(ValueError):
+            game.render()
+
+
+    def test_render(self):
+        ''' tests the off-screen rendering'''
+        pygame.quit()
+        game = h.build_headless(s.Settings(), render=True)
+        game.run(10, render=True)
+        frame = game.render()
+        assert frame.get_size() == s.Settings.window_size
+        particle = game.eruptor.particles[0]
+        assert frame.get_at(particle.box.center) \
+            == pygame.Color(s.Settings.particle_color)
+        assert not pygame.display.get_init()
+
+
+    def test_analytic(self):
+        ''' tests that the settings select the analytic volcano'''
+        settings = s.Settings()
+        settings.analytic_trajectories = True
+        game = h.build_headless(settings)
+        game.run(30)
+        assert isinstance(game.eruptor, v.AnalyticVolcano)
+        assert len(game.eruptor.store) == 20
+
+
+    def test_vents(self):
+        ''' tests that vent positions select a volcanic field, which
+            doesn't follow analytic trajectories
+        '''
+        settings = s.Settings()
+        settings.vent_positions = [(.3, 0), (.7, 0)]
+        game = h.build_headless(settings)
+        game.run(30)
+        assert isinstance(game.eruptor, v.VolcanicField)
+        assert len(game.eruptor.store) == 40
+        settings.analytic_trajectories = True
+        with pytest.raises(ValueError):
+            h.build_headless(settings)
@@ -0,0 +1,119 @@
+''' tests the density and landing accumulator '''
+
+import numpy as np
+import pytest
+import games.volcano_sim.heatmap as hm
+import games.volcano_sim.settings as s
+import games.volcano_sim.particle as p
+import games.volcano_sim.volcano as v
+
+
+class TestHeatmapAccumulator:
+    ''' tests the class HeatmapAccumulator'''
+    @pytest.fixture
+    def heatmap(self):
+        ''' a small accumulator'''
+        return hm.HeatmapAccumulator((4, 2), landing_bins=4)
+
+
+    def test_accumulate(self, heatmap):
+        ''' tests binning, y pointing down and ignored outsiders'''
+        x = np.array([0., .3, 1., 1., -.1, .5])
+        y = np.array([0., .9, 1., .2, .5, 1.1])
+        heatmap.accumulate(x, y)
+        heatmap.accumulate(x[:1], y[:1])
+        assert heatmap.samples == 2
+        assert heatmap.density.tolist() == [[0, 2], [1, 0], [0, 0], [1, 1]]
+
+
+    def test_landings(self, heatmap):
+        ''' tests the landing positions and their histogram'''
+        heatmap.record_landings(np.array([.1, .6]))
+        heatmap.record_landings(np.empty(0))
+        heatmap.record_landings(np.array([1.]))
+        assert heatmap.landing_x.tolist() == [.1, .6, 1.]
+        assert heatmap.landing_histogram.tolist() == [1, 0, 1, 1]
+        heatmap.clear()
+        assert len(heatmap.landing_x) == 0
+        assert heatmap.landing_histogram.sum() == 0
+
+
+    def test_overlay(self, heatmap):
+        ''' tests that the overlay is scaled and only shows visited bins'''
+        heatmap.accumulate(np.array([.1]), np.array([.9]))
+        overlay = heatmap.overlay((40, 20))
+        assert overlay.get_size() == (40, 20)
+        assert overlay.get_at((5, 5))[:3] != (0, 0, 0)
+        assert overlay.get_colorkey()[:3] == (0, 0, 0)
+        assert overlay.get_at((35, 15))[:3] == (0, 0, 0)
+
+
+    def test_landings_only(self):
+        ''' tests that without a resolution only the landings count'''
+        heatmap = hm.HeatmapAccumulator(None, landing_bins=4)
+        heatmap.accumulate(np.array([.5]), np.array([.5]))
+        heatmap.record_landings(np.array([.1, .6]))
+        assert heatmap.density is None and heatmap.resolution is None
+        assert heatmap.samples == 1
+        assert heatmap.landing_histogram.tolist() == [1, 0, 1, 0]
+        heatmap.clear()
+        with pytest.raises(ValueError):
+            heatmap.overlay((40, 20))
+
+
+    def test_invalid(self):
+        ''' tests the validation of the resolution'''
+        with pytest.raises(ValueError):
+            hm.HeatmapAccumulator((0, 10))
+
+
+class TestVolcanoHeatmap:
+    ''' tests that the volcanoes feed the accumulator'''
+    def run(self, volcano_class, advance=False):
+        ''' runs a seeded volcano with a heatmap, tick by tick or with
+            advance
+        '''
+        settings = s.Settings()
+        settings.gravity = (0, -.0001)
+        settings.seed = 3
+        volcano = volcano_class(settings, p.Particle(settings))
+        volcano.heatmap = hm.HeatmapAccumulator()
+        landed = 0
+        if advance:
+            volcano.advance(300)
+        for _ in range(0 if advance else 300):
+            landed += int((volcano.store.y < 0).sum())
+            volcano.destroy_out_of_bounds()
+            volcano.erupt()
+            volcano.step()
+        return volcano.heatmap, landed
+
+
+    def test_volcano(self):
+        ''' tests that every tick and landing is recorded'''
+        heatmap, landed = self.run(v.Volcano)
+        assert heatmap.samples == 300
+        assert heatmap.density.sum() > 0
+        assert landed > 0 and len(heatmap.landing_x) == landed
+
+
+    @pytest.mark.parametrize('volcano_class', [v.Volcano, v.AnalyticVolcano])
+    def test_advance(self, volcano_class):
+        ''' tests that skipping idle ticks doesn't lose any samples'''
+        ticked, _ = self.run(volcano_class)
+        advanced, _ = self.run(volcano_class, advance=True)
+        assert advanced.samples == ticked.samples == 300
+        assert np.array_equal(advanced.density, ticked.density)
+        assert advanced.landing_x.tolist() == pytest.approx(
+            ticked.landing_x.tolist()
+        )
+
+
+    def test_analytic(self):
+        ''' tests that the analytic volcano lands in the same places'''
+        heatmap, _ = self.run(v.Volcano)
+        analytic, _ = self.run(v.AnalyticVolcano)
+        assert analytic.landing_x.tolist() == pytest.approx(
+            heatmap.landing_x.tolist()
+        )
+        assert np.array_equal(analytic.density, heatmap.density)
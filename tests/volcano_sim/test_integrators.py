@@ -0,0 +1,75 @@
+''' tests the integrators '''
+
+import math
+import numpy as np
+import pytest
+import games.volcano_sim.integrators as i
+
+GRAVITY = (.01, -.02)
+
+
+def gravity(x, y, vx, vy):
+    ''' constant acceleration'''
+    return GRAVITY
+
+
+def spring(x, y, vx, vy):
+    ''' harmonic oscillator around the origin'''
+    return -x, -y
+
+
+def arrays():
+    ''' returns x, y, vx and vy of two particles'''
+    return (
+        np.array([.5, .2]), np.array([0., .1]),
+        np.array([0., .03]), np.array([.1, .05])
+    )
+
+
+class TestIntegrators:
+    ''' tests the integrator functions'''
+    @pytest.mark.parametrize('name', ['verlet', 'rk4'])
+    @pytest.mark.parametrize('substeps', [1, 4])
+    def test_exact_parabola(self, name, substeps):
+        ''' tests that higher order integrators are exact under gravity'''
+        x, y, vx, vy = arrays()
+        x_0, y_0, vx_0, vy_0 = x.copy(), y.copy(), vx.copy(), vy.copy()
+        ticks = 10
+        for _ in range(ticks):
+            i.integrate(x, y, vx, vy, gravity, i.get_integrator(name),
+                        substeps)
+        assert list(x) == pytest.approx(
+            list(x_0 + vx_0 * ticks + GRAVITY[0] * ticks ** 2 / 2)
+        )
+        assert list(y) == pytest.approx(
+            list(y_0 + vy_0 * ticks + GRAVITY[1] * ticks ** 2 / 2)
+        )
+        assert list(vy) == pytest.approx(list(vy_0 + GRAVITY[1] * ticks))
+
+
+    def test_euler_matches_volcano_step(self):
+        ''' tests that euler with one substep is the original step'''
+        x, y, vx, vy = arrays()
+        i.integrate(x, y, vx, vy, gravity, i.semi_implicit_euler)
+        assert list(vy) == [.1 - .02, .05 - .02]
+        assert list(y) == [0 + (.1 - .02), .1 + (.05 - .02)]
+
+
+    def test_accuracy_order(self):
+        ''' tests the errors of the integrators on an oscillator'''
+        errors = {}
+        for name in i.INTEGRATORS:
+            x, y = np.array([1.]), np.array([0.])
+            vx, vy = np.array([0.]), np.array([0.])
+            for _ in range(10):
+                i.integrate(x, y, vx, vy, spring, i.get_integrator(name),
+                            substeps=10)
+            # starting at rest at x = 1, the exact x is cos(t)
+            errors[name] = abs(x[0] - math.cos(10))
+        assert errors['rk4'] < errors['verlet'] < errors['euler']
+
+
+    def test_unknown(self):
+        ''' tests that unknown integrator names are rejected'''
+        with pytest.raises(ValueError):
+            i.get_integrator('leapfrog')
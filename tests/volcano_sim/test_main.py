@@ -1,12 +1,16 @@
 '''tests functions and classes in volcano.py'''
 import pytest
-import games.main as m
-import games.settings as s
-import games.pyclock as c
-import games.planet as p
-import games.volcano as v
-import games.particle as part
-import games.coord_converter as cc
+import pygame
+import numpy as np
+import games.volcano_sim.main as m
+import games.volcano_sim.settings as s
+import games.volcano_sim.pyclock as c
+import games.volcano_sim.planet as p
+import games.volcano_sim.volcano as v
+import games.volcano_sim.particle as part
+import games.volcano_sim.coord_converter as cc
+import games.volcano_sim.profiler as pr
+import games.volcano_sim.heatmap as hm
 
 DEFAULT_WINDOW = (100, 100)
 HIGH_PRECISION_FLOAT = .243124123476761273
@@ -17,6 +21,7 @@ class TestGame:
     @pytest.fixture
     def game(self):
         ''' creates a game object'''
+        pygame.font.init()
         settings = s.Settings()
         clock = c.PyClock(settings)
         particle = part.Particle(settings)
@@ -32,6 +37,55 @@ class TestGame:
         hasattr(game_instance, 'game_map')
 
 
+    def test_dirty_rects(self, game):
+        ''' tests that pushing only the dirty rects gives the full image'''
+        game_instance = game
+        eruptor = game_instance.game_map.eruptor
+        eruptor.store.spawn([.3, .6], [.5, .5], .01, .01)
+        for _ in range(3):
+            eruptor.step()
+            game_instance.update_dirty_rects()
+        expected = game_instance.game_map.background.copy()
+        for particle in eruptor.particles:
+            expected.blit(particle.image, particle.box)
+        assert pygame.image.tobytes(game_instance.screen, 'RGB') \
+            == pygame.image.tobytes(expected, 'RGB')
+        assert game_instance._previous_rects \
+            == game_instance.game_map.particle_rects()
+
+
+    def test_overlay(self, game):
+        ''' tests that the overlay is only drawn when switched on'''
+        game_instance = game
+        assert game_instance.blit_overlay() == []
+        game_instance._profile_overlay = True
+        game_instance.profiler = pr.FrameProfiler()
+        with game_instance.profiler.phase('step'):
+            pass
+        game_instance.profiler.end_frame()
+        assert len(game_instance.blit_overlay()) == 2
+
+
+    def test_heatmap_overlay(self, game):
+        ''' tests that the heatmap is cached between refreshes'''
+        game_instance = game
+        eruptor = game_instance.game_map.eruptor
+        assert game_instance.blit_heatmap() == []
+        game_instance._heatmap_overlay = True
+        eruptor.heatmap = hm.HeatmapAccumulator()
+        assert game_instance.blit_heatmap() == [
+            game_instance.screen.get_rect()
+        ]
+        image = game_instance._heatmap_image
+        eruptor.step()
+        game_instance.blit_heatmap()
+        assert game_instance._heatmap_image is image
+        for _ in range(game_instance._heatmap_refresh_ticks):
+            eruptor.step()
+        game_instance.blit_heatmap()
+        assert game_instance._heatmap_image is not image
+
+
 class TestCoordConverter:
     ''' tests the coordinate conversion functions'''
     @pytest.fixture
@@ -82,4 +136,39 @@ class TestCoordConverter:
             (HIGH_PRECISION_FLOAT, HIGH_PRECISION_FLOAT)
         ) == (24, 24)
         assert ex_converter.convert_dimensions_to_px((1,1,)) == (100, 100)
-        assert ex_converter.convert_dimensions_to_px((0, 0,)) == (0, 0)
\ No newline at end of file
+        assert ex_converter.convert_dimensions_to_px((0, 0,)) == (0, 0)
+
+
+    def test_array_conversions(self, converter):
+        ''' tests that the array conversions match the scalar ones'''
+        ex_converter = converter
+        coords = np.array([0, .5, 1, HIGH_PRECISION_FLOAT, .125, .135])
+        x_px, y_px = ex_converter.convert_internal_arrays_to_px(
+            coords, coords
+        )
+        assert list(x_px) == [ex_converter.convert_x_to_px(x) for x in coords]
+        assert list(y_px) == [ex_converter.convert_y_to_px(y) for y in coords]
+        widths, heights = ex_converter.convert_dimension_arrays_to_px(
+            coords, coords
+        )
+        assert list(zip(widths, heights)) == [
+            ex_converter.convert_dimensions_to_px((x, x)) for x in coords
+        ]
+        out = (np.zeros(6, dtype=np.int64), np.zeros(6, dtype=np.int64))
+        ex_converter.convert_internal_arrays_to_px(coords, coords, out=out)
+        assert list(out[0]) == list(x_px)
+        assert list(out[1]) == list(y_px)
+        with pytest.raises(ValueError):
+            ex_converter.convert_internal_arrays_to_px(coords, coords[:2])
+
+
+    def test_window_size_change(self, converter):
+        ''' tests that the array scale follows the window size'''
+        ex_converter = converter
+        ex_converter.window_size = (200, 50)
+        x_px, y_px = ex_converter.convert_internal_arrays_to_px(
+            np.array([.5]), np.array([.5])
+        )
+        assert (x_px[0], y_px[0]) == ex_converter.convert_internals_to_px(
+            (.5, .5)
+        )
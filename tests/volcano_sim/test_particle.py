@@ -3,8 +3,8 @@
 import math
 import pytest
 import pygame
-import games.settings as s
-import games.particle as p
+import games.volcano_sim.settings as s
+import games.volcano_sim.particle as p
 
 TEST_ACCEL = (0, -.1)
 TEST_ANGLE = 2
@@ -75,9 +75,13 @@ class TestParticle:
         ''' tests the conditions for the random particle generation'''
         class Settings:
             ''' settings'''
-            def __init__(self):
-                self.particle_size = (.05, .05)
-                self.particle_position = (.5, 0)
+            window_size = (100, 100)
+            particle_size = (.05, .05)
+            starting_position = (.5, 0)
+            particle_color = 'red'
+            default_velocity = .1
+            randomness = True
+            seed = None
 
         particle_list = []
         for _ in range(1_000):
@@ -91,6 +95,6 @@ class TestParticle:
         y_list = [particle.velocity[1] for particle in particle_list]
         thetas = []
         for x, y in zip(x_list, y_list):
-            thetas.append(math.atan(x, y))
+            thetas.append(math.atan2(x, y))
         assert max(thetas) < TEST_ANGLE/360 * 2*math.pi
         assert min(thetas) > - TEST_ANGLE/360 * 2*math.pi
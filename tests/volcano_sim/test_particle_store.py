@@ -0,0 +1,116 @@
+''' tests the ParticleStore class '''
+
+import pytest
+import games.volcano_sim.particle_store as ps
+
+
+class TestParticleStore:
+    ''' tests the class ParticleStore'''
+    @pytest.fixture
+    def store(self):
+        ''' constructs a small ParticleStore object'''
+        store = ps.ParticleStore(capacity=2)
+        return store
+
+
+    def test_spawn(self, store):
+        ''' tests that scalars and arrays can be spawned'''
+        store.spawn(.5, 0, 0, .1)
+        store.spawn([.1, .2], [.3, .4], 0, [.5, .6])
+        assert len(store) == 3
+        assert list(store.x) == [.5, .1, .2]
+        assert list(store.vy) == [.1, .5, .6]
+        assert list(store.vx) == [0, 0, 0]
+        assert all(store.alive)
+        assert list(store.age) == [0, 0, 0]
+
+
+    def test_growth(self, store):
+        ''' tests that the arrays grow and keep their content'''
+        store.spawn(list(range(5)), 0, 0, 0)
+        assert store.capacity == 8
+        assert list(store.x) == [0, 1, 2, 3, 4]
+
+
+    def test_remove(self, store):
+        ''' tests that removing moves the last particle into the slot'''
+        store.spawn([.1, .2, .3], 0, 0, 0)
+        store.remove(0)
+        assert list(store.x) == [.3, .2]
+        with pytest.raises(IndexError):
+            store.remove(2)
+
+
+    def test_compact(self, store):
+        ''' tests that dead particles are removed and the order is kept'''
+        store.spawn([.1, .2, .3, .4, .5], 0, [1, 2, 3, 4, 5], 0)
+        store.alive[[0, 2]] = False
+        store.compact()
+        assert len(store) == 3
+        assert list(store.x) == [.2, .4, .5]
+        assert list(store.vx) == [2, 4, 5]
+        assert all(store.alive)
+        store.compact()
+        assert len(store) == 3
+
+
+    def test_columns(self):
+        ''' tests that extra columns grow and compact with the others'''
+        store = ps.ParticleStore(capacity=2, columns={'tag': int})
+        store.spawn([.1, .2, .3], 0, 0, 0)
+        store.column('tag')[:] = [1, 2, 3]
+        store.alive[1] = False
+        store.compact()
+        assert list(store.column('tag')) == [1, 3]
+        store.spawn(.4, 0, 0, 0)
+        assert list(store.column('tag')) == [1, 3, 0]
+
+
+    def test_clear(self, store):
+        ''' tests that clearing keeps the memory'''
+        store.spawn([.1, .2, .3], 0, 0, 0)
+        store.clear()
+        assert len(store) == 0
+        assert store.capacity == 4
+
+
+    def test_invalid_capacity(self):
+        ''' tests that the capacity must be a positive integer'''
+        with pytest.raises(ValueError):
+            ps.ParticleStore(capacity=0)
+        with pytest.raises(ValueError):
+            ps.ParticleStore(capacity=4, max_capacity=0)
+
+
+    def test_recycling(self, store):
+        ''' tests that destroyed slots are reused without growing'''
+        store.spawn([.1, .2], 0, 0, 0)
+        for _ in range(10):
+            store.alive[:] = False
+            store.compact()
+            store.spawn([.1, .2], 0, 0, 0)
+        stats = store.stats
+        assert stats['capacity'] == 2
+        assert stats['live'] == 2
+        assert stats['high_water_mark'] == 2
+        assert stats['recycled'] == 20
+        assert stats['grown'] == 0
+
+
+    def test_capacity_clamped(self):
+        ''' tests that a capacity above max_capacity is reduced to it'''
+        store = ps.ParticleStore(capacity=4, max_capacity=2)
+        assert store.capacity == 2
+        assert store.spawn([.1, .2, .3], 0, 0, 0) == 2
+
+
+    def test_max_capacity(self):
+        ''' tests that spawns over the max_capacity are dropped'''
+        store = ps.ParticleStore(capacity=2, max_capacity=3)
+        assert store.spawn([.1, .2], 0, 0, 0) == 2
+        assert store.spawn([.3, .4], 0, 0, 0) == 1
+        assert store.spawn(.5, 0, 0, 0) == 0
+        assert list(store.x) == [.1, .2, .3]
+        assert store.stats['capacity'] == 3
+        assert store.stats['dropped'] == 2
+        assert store.stats['grown'] == 1
@@ -0,0 +1,100 @@
+''' tests the planet class '''
+
+import pytest
+import pygame
+import games.volcano_sim.settings as s
+import games.volcano_sim.particle as part
+import games.volcano_sim.volcano as v
+import games.volcano_sim.planet as p
+
+
+class TestPlanet:
+    ''' tests the class Planet'''
+    @pytest.fixture
+    def planet(self):
+        ''' constructs a Planet object with a few particles, no clock'''
+        settings = s.Settings()
+        volcano = v.Volcano(settings, part.Particle(settings))
+        volcano.store.spawn(
+            [.5, .2, .99, .01, .5], [.5, .3, .5, .99, 0], 0, 0
+        )
+        volcano.update_pixel_centers()
+        planet = p.Planet(volcano, settings, None)
+        return planet
+
+
+    def reference_background(self, planet):
+        ''' blits every particle separately, as a reference'''
+        background = planet.background.copy()
+        for particle in planet.eruptor.particles:
+            background.blit(particle.image, particle.box)
+        return background
+
+
+    def test_blits(self, planet):
+        ''' tests that the batched blit matches single blits'''
+        expected = self.reference_background(planet)
+        planet.blit_volcano()
+        assert pygame.image.tobytes(planet.background, 'RGB') \
+            == pygame.image.tobytes(expected, 'RGB')
+
+
+    def test_pixels(self, planet):
+        ''' tests that drawing into the pixels matches single blits'''
+        expected = self.reference_background(planet)
+        planet._render_mode = 'pixels'
+        planet.blit_volcano()
+        assert pygame.image.tobytes(planet.background, 'RGB') \
+            == pygame.image.tobytes(expected, 'RGB')
+
+
+    def test_unknown_mode(self, planet):
+        ''' tests that an unknown render mode is rejected'''
+        planet._render_mode = 'unknown'
+        with pytest.raises(ValueError):
+            planet.blit_volcano()
+
+
+    def test_refresh_background(self, planet):
+        ''' tests that the background is restored in place, planet included'''
+        background = planet.background
+        planet.blit_volcano()
+        planet.refresh_background()
+        assert planet.background is background
+        assert pygame.image.tobytes(background, 'RGB') \
+            == pygame.image.tobytes(planet._default_background, 'RGB')
+        assert background.get_at(planet._planet_rect.center) \
+            == pygame.Color(s.Settings.planet_color)
+
+
+    @pytest.mark.parametrize('mode', ['blits', 'pixels'])
+    def test_vents(self, mode):
+        ''' tests drawing the particles of several vents in one pass'''
+        settings = s.Settings()
+        volcano = v.VolcanicField.from_positions(
+            settings, [(.2, .5), (.5, .5), (.8, .5)], ['red', 'blue', 'red']
+        )
+        volcano.single_expulsion()
+        planet = p.Planet(volcano, settings, None)
+        planet._render_mode = mode
+        expected = self.reference_background(planet)
+        planet.blit_volcano()
+        assert pygame.image.tobytes(planet.background, 'RGB') \
+            == pygame.image.tobytes(expected, 'RGB')
+        assert planet.particle_rects() == [
+            particle.box for particle in volcano.particles
+        ]
+
+
+    def test_cone(self):
+        ''' tests that the terrain cone is drawn above the planet'''
+        settings = s.Settings()
+        settings.terrain_cone = (.2, .1)
+        volcano = v.Volcano(settings, part.Particle(settings))
+        planet = p.Planet(volcano, settings, None)
+        inside_cone = planet.convert_internals_to_px((.5, .2))
+        beside_cone = planet.convert_internals_to_px((.3, .2))
+        assert planet.background.get_at(inside_cone) \
+            == pygame.Color(s.Settings.planet_color)
+        assert planet.background.get_at(beside_cone) \
+            == pygame.Color('purple')
@@ -0,0 +1,56 @@
+''' tests the FrameProfiler class '''
+
+import pstats
+import pytest
+import games.volcano_sim.profiler as pr
+
+
+class TestFrameProfiler:
+    ''' tests the class FrameProfiler'''
+    @pytest.fixture
+    def profiler(self):
+        ''' constructs a FrameProfiler over the last 10 frames'''
+        profiler = pr.FrameProfiler(window=10)
+        return profiler
+
+
+    def test_phases(self, profiler):
+        ''' tests that every phase gets its own rolling percentiles'''
+        for frame in range(20):
+            with profiler.phase('step'):
+                pass
+            with profiler.phase('erupt'):
+                sum(range(1_000))
+            profiler.end_frame(particles=frame)
+        assert profiler.frames == 20
+        assert list(profiler.particle_counts) == list(range(10, 20))
+        summary = profiler.summary()
+        assert set(summary) == {'step', 'erupt'}
+        assert set(summary['step']) == {'p50', 'p95', 'p99'}
+        assert summary['erupt']['p50'] <= summary['erupt']['p99']
+        assert profiler.overlay_lines()[0] == 'particles: 19'
+
+
+    def test_disabled(self):
+        ''' tests that a disabled profiler records nothing'''
+        profiler = pr.FrameProfiler(enabled=False)
+        with profiler.phase('step'):
+            pass
+        profiler.end_frame(particles=5)
+        assert profiler.frames == 1
+        assert profiler.summary() == {}
+        assert profiler.percentiles('step')['p99'] == 0
+
+
+    def test_profile_frames(self, profiler, tmp_path):
+        ''' tests that cProfile wraps the given number of frames'''
+        path = str(tmp_path / 'frames.prof')
+        profiler.profile_frames(2, path)
+        assert profiler.profiling
+        profiler.end_frame()
+        assert profiler.profiling
+        profiler.end_frame()
+        assert not profiler.profiling
+        assert pstats.Stats(path).total_calls > 0
+        with pytest.raises(ValueError):
+            profiler.profile_frames(0, path)
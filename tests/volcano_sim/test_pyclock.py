@@ -0,0 +1,67 @@
+''' tests the PyClock class '''
+
+import pytest
+import pygame
+import games.volcano_sim.settings as s
+import games.volcano_sim.pyclock as c
+
+
+class TestPyClock:
+    ''' tests the class PyClock'''
+    @pytest.fixture
+    def clock(self):
+        ''' constructs a PyClock with 100 physics steps per second'''
+        pygame.font.init()
+        settings = s.Settings()
+        settings.physics_hz = 100
+        settings.max_substeps = 3
+        clock = c.PyClock(settings)
+        return clock
+
+
+    def test_fixed_steps(self, clock):
+        ''' tests that elapsed time is split into fixed steps'''
+        assert clock.add_time(25) == 2
+        assert clock.add_time(4) == 0
+        assert clock.add_time(1) == 1
+        assert clock.add_time(0) == 0
+
+
+    def test_max_substeps(self, clock):
+        ''' tests that a long frame is capped and its backlog dropped'''
+        assert clock.add_time(1_000) == 3
+        assert clock.add_time(5) == 0
+        assert clock.add_time(5) == 1
+
+
+    def test_glyph_text(self, clock):
+        ''' tests that glyphs are cached and unchanged text is reused'''
+        text = c.GlyphText(clock.font)
+        image = text.render('123')
+        assert text.render('123') is image
+        assert text.glyphs == 3
+        other = text.render('3211')
+        assert other is not image
+        assert text.glyphs == 3
+        assert other.get_width() > image.get_width()
+        assert other.get_height() == clock.font.get_height()
+
+
+    def test_refresh_cap(self, clock):
+        ''' tests that the image is only refreshed after the interval'''
+        clock._text = c.GlyphText(clock.font)
+        image = clock.image
+        clock.update_image()
+        assert clock.image is image
+        clock._last_refresh -= 1
+        clock.update_image()
+        assert clock.image is not image
+
+
+    def test_time_scale(self, clock):
+        ''' tests that the time scale speeds up the simulation'''
+        clock.time_scale = 2
+        assert clock.add_time(25) == 5
+        assert clock.add_time(1_000) == 6
+        with pytest.raises(ValueError):
+            clock.time_scale = 0
@@ -0,0 +1,148 @@
+''' tests seeded runs, recording and replaying them '''
+
+import numpy as np
+import pytest
+import games.volcano_sim.settings as s
+import games.volcano_sim.particle as p
+import games.volcano_sim.volcano as v
+import games.volcano_sim.recording as r
+import games.volcano_sim.replay as rp
+
+TICKS = 200
+
+
+@pytest.fixture
+def settings():
+    ''' seeded settings with a gravity that makes particles land'''
+    settings = s.Settings()
+    settings.seed = 7
+    settings.gravity = (0, -.0001)
+    return settings
+
+
+def record(settings, path, mode):
+    ''' records a run, returns the positions after every tick'''
+    volcano = v.Volcano(settings, p.Particle(settings))
+    positions = {}
+    with r.Recorder.from_settings(path, settings, mode) as recorder:
+        volcano.recorder = recorder
+        for tick in range(1, TICKS + 1):
+            volcano.destroy_out_of_bounds()
+            volcano.erupt()
+            volcano.step()
+            positions[tick] = (volcano.store.x.copy(), volcano.store.y.copy())
+    return positions
+
+
+class TestSeed:
+    ''' tests that the seed makes runs reproducible'''
+    def test_volcano(self, settings):
+        ''' tests that equally seeded volcanoes spawn the same particles'''
+        first, second = (
+            v.Volcano(settings, p.Particle(settings)) for _ in range(2)
+        )
+        first.advance(50)
+        second.advance(50)
+        assert np.array_equal(first.store.vx, second.store.vx)
+
+
+    def test_particle(self, settings):
+        ''' tests that equally seeded particles draw the same velocity'''
+        first, second = (
+            p.Particle(settings, .1, .01, 10) for _ in range(2)
+        )
+        assert first.velocity == second.velocity
+
+
+class TestRecording:
+    ''' tests the file format and the replaying eruptors'''
+    def test_header(self, settings, tmp_path):
+        ''' tests that seed, gravity and mode survive the round trip'''
+        path = tmp_path / 'run.vsim'
+        record(settings, path, 'events')
+        recording = r.Recording(path)
+        assert recording.mode == 'events'
+        assert recording.seed == 7
+        assert recording.gravity == settings.gravity
+        assert recording.integrator == 'euler'
+        assert recording.substeps == 1
+        assert recording.collision is None
+        assert not recording.interactions
+        assert recording.ticks == sorted(recording.ticks)
+        assert len(recording) == 60  # 20 ticks each in 3 eruptions
+
+
+    def test_replay_events(self, settings, tmp_path):
+        ''' tests that replaying the spawns reproduces the run, also
+            when seeking back and forth
+        '''
+        path = tmp_path / 'run.vsim'
+        positions = record(settings, path, 'events')
+        replay = rp.build_replay(r.Recording(path), settings)
+        assert isinstance(replay, rp.ReplayVolcano)
+        replay.advance(TICKS)
+        assert replay.finished
+        for tick in (TICKS, 50, 120):
+            replay.seek(tick)
+            replay.destroy_out_of_bounds()
+            x, y = positions[tick]
+            inside = (y >= 0) & (x >= 0) & (x <= 1)  # not culled yet
+            x, y = x[inside], y[inside]
+            assert sorted(replay.store.y) == pytest.approx(sorted(y))
+            assert sorted(replay.store.x) == pytest.approx(sorted(x))
+
+
+    def test_simulation_settings(self, settings, tmp_path):
+        ''' tests that events are only replayed if the closed form
+            reproduces how the run was simulated
+        '''
+        path = tmp_path / 'run.vsim'
+        settings.integrator = 'verlet'
+        settings.collision = 'bounce'
+        record(settings, path, 'events')
+        recording = r.Recording(path)
+        assert recording.integrator == 'verlet'
+        assert recording.collision == 'bounce'
+        with pytest.raises(ValueError):
+            rp.build_replay(recording, s.Settings())
+
+
+    def test_states_while_advancing(self, settings, tmp_path):
+        ''' tests that skipping idle ticks doesn't leave gaps in a
+            'states' recording
+        '''
+        path = tmp_path / 'run.vsim'
+        for volcano_class in (v.Volcano, v.AnalyticVolcano):
+            volcano = volcano_class(settings, p.Particle(settings))
+            with r.Recorder(path, 'states') as recorder:
+                volcano.recorder = recorder
+                volcano.advance(TICKS)
+            assert r.Recording(path).ticks == list(range(1, TICKS + 1))
+
+
+    def test_replay_states(self, settings, tmp_path):
+        ''' tests that the stored states are shown tick by tick'''
+        path = tmp_path / 'run.vsim'
+        positions = record(settings, path, 'states')
+        replay = rp.build_replay(r.Recording(path), settings)
+        assert isinstance(replay, rp.StateReplayVolcano)
+        replay.seek(99)
+        replay.step()
+        x, y = positions[100]
+        assert list(replay.store.x) == pytest.approx(list(x))
+        assert list(replay.store.y) == pytest.approx(list(y))
+        replay.advance(TICKS)
+        assert replay.finished and len(replay.store) == 0
+
+
+    def test_invalid(self, settings, tmp_path):
+        ''' tests that foreign files and wrong modes are rejected'''
+        path = tmp_path / 'run.vsim'
+        path.write_bytes(b'not a recording' * 4)
+        with pytest.raises(ValueError):
+            r.Recording(path)
+        with pytest.raises(ValueError):
+            r.Recorder(path, 'frames')
+        record(settings, path, 'states')
+        with pytest.raises(ValueError):
+            rp.ReplayVolcano(settings, p.Particle(settings), r.Recording(path))
@@ -0,0 +1,79 @@
+''' tests the spatial grid '''
+
+import numpy as np
+import pytest
+import games.volcano_sim.spatial_grid as sg
+
+
+def brute_force_pairs(x, y, radius):
+    ''' returns all close pairs by comparing every pair'''
+    return {
+        (i, j) for i in range(len(x)) for j in range(i + 1, len(x))
+        if (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 < radius ** 2
+    }
+
+
+class TestSpatialGrid:
+    ''' tests the class SpatialGrid'''
+    @pytest.fixture
+    def positions(self):
+        ''' random positions, some of them outside the window'''
+        rng = np.random.default_rng(0)
+        return rng.uniform(-.1, 1.1, 500), rng.uniform(-.1, 1.1, 500)
+
+
+    def test_build(self, positions):
+        ''' tests that the particles are sorted into their cells'''
+        x, y = positions
+        grid = sg.SpatialGrid(.1)
+        grid.build(x, y)
+        assert grid.cells == 10
+        assert len(grid) == 500 and grid.starts[-1] == 500
+        cell = np.clip(np.floor(y * 10), 0, 9) * 10 \
+            + np.clip(np.floor(x * 10), 0, 9)
+        assert (np.diff(cell[grid.order]) >= 0).all()
+
+
+    @pytest.mark.parametrize('radius', [.03, .1])
+    def test_pairs(self, positions, radius):
+        ''' tests that the pairs equal the brute force result'''
+        x, y = positions
+        grid = sg.SpatialGrid(.1)
+        grid.build(x, y)
+        first, second = grid.pairs(x, y, radius)
+        found = {tuple(sorted(pair)) for pair in zip(first, second)}
+        assert len(found) == len(first)
+        assert found == brute_force_pairs(x, y, radius)
+
+
+    def test_query(self, positions):
+        ''' tests that the candidates contain all close particles'''
+        x, y = positions
+        grid = sg.SpatialGrid(.1)
+        grid.build(x, y)
+        candidates = set(grid.query(.5, .5).tolist())
+        close = np.flatnonzero(np.hypot(x - .5, y - .5) < .1)
+        assert set(close.tolist()) <= candidates
+        assert len(candidates) < 500
+
+
+    def test_neighbour_counts(self):
+        ''' tests the local density'''
+        grid = sg.SpatialGrid(.2)
+        x, y = np.array([.5, .55, .6, .9]), np.array([.5, .5, .5, .9])
+        grid.build(x, y)
+        assert grid.neighbour_counts(x, y, .08).tolist() == [1, 2, 1, 0]
+
+
+    def test_empty(self):
+        ''' tests a grid without particles'''
+        grid = sg.SpatialGrid(.5)
+        grid.build(np.empty(0), np.empty(0))
+        first, second = grid.pairs(np.empty(0), np.empty(0), .5)
+        assert len(first) == len(second) == 0
+
+
+    def test_invalid(self):
+        ''' tests the validation of the cell size'''
+        with pytest.raises(ValueError):
+            sg.SpatialGrid(0)
@@ -0,0 +1,63 @@
+''' tests the SpriteCache class '''
+
+import pytest
+import pygame
+import games.volcano_sim.settings as s
+import games.volcano_sim.particle as p
+import games.volcano_sim.sprite_cache as sc
+
+
+class TestSpriteCache:
+    ''' tests the class SpriteCache'''
+    @pytest.fixture
+    def cache(self):
+        ''' constructs a cache fitting two 10x10 sprites (32 bit)'''
+        cache = sc.SpriteCache(max_bytes=800)
+        return cache
+
+
+    def test_shared_sprites(self, cache):
+        ''' tests that equal keys share one surface'''
+        sprite = cache.get((10, 10), 'red')
+        assert cache.get((10, 10), (255, 0, 0)) is sprite
+        assert cache.get((10, 10), 'blue') is not sprite
+        assert cache.get((10, 10), 'red', alpha=128) is not sprite
+        assert sprite.get_at((0, 0)) == pygame.Color('red')
+
+
+    def test_alpha(self, cache):
+        ''' tests the per-pixel alpha of the sprites'''
+        sprite = cache.get((2, 2), 'red', alpha=100)
+        assert sprite.get_at((1, 1)) == pygame.Color(255, 0, 0, 100)
+
+
+    def test_eviction(self, cache):
+        ''' tests that the least recently used sprite is evicted first'''
+        red = cache.get((10, 10), 'red')
+        blue = cache.get((10, 10), 'blue')
+        assert cache.get((10, 10), 'red') is red
+        cache.get((10, 10), 'green')
+        assert len(cache) == 2
+        assert cache.bytes <= 800
+        assert cache.get((10, 10), 'red') is red
+        assert cache.get((10, 10), 'blue') is not blue
+
+
+    def test_conversion(self, cache):
+        ''' tests that sprites are converted once there is a display'''
+        pygame.quit()
+        sprite = cache.get((10, 10), 'red')
+        pygame.display.init()
+        pygame.display.set_mode((20, 20))
+        converted = cache.get((10, 10), 'red')
+        assert converted is not sprite
+        assert cache.get((10, 10), 'red') is converted
+        pygame.quit()
+
+
+    def test_particles_share_images(self):
+        ''' tests that particles with equal settings share their image'''
+        first = p.Particle(s.Settings())
+        second = p.Particle(s.Settings())
+        assert first.image is second.image
+        assert p.Particle.like_particle(first).image is first.image
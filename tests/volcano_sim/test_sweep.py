@@ -0,0 +1,66 @@
+''' tests the parameter sweep runner '''
+
+import numpy as np
+import pytest
+import games.volcano_sim.sweep as sw
+
+
+class TestConfigurations:
+    ''' tests building the configurations'''
+    def test_grid(self):
+        ''' tests that the grid holds every combination'''
+        configurations = sw.grid(angle_spread=[2, 10], gravity=[-1, -2, -3])
+        assert len(configurations) == 6
+        assert {'angle_spread': 10, 'gravity': -3} in configurations
+
+
+    def test_random_sample(self):
+        ''' tests ranges, integer fields and seeding'''
+        configurations = sw.random_sample(
+            50, 1, default_velocity=(.001, .002),
+            concurrent_expulsions=(1, 10)
+        )
+        assert configurations == sw.random_sample(
+            50, 1, default_velocity=(.001, .002),
+            concurrent_expulsions=(1, 10)
+        )
+        for configuration in configurations:
+            assert .001 <= configuration['default_velocity'] <= .002
+            assert isinstance(configuration['concurrent_expulsions'], int)
+
+
+    def test_apply(self):
+        ''' tests that the fields end up in the settings'''
+        settings = sw.apply({'gravity': -.5, 'concurrent_expulsions': 3})
+        assert settings.gravity == (0, -.5)
+        assert settings.concurrent_expulsions == 3
+        with pytest.raises(ValueError):
+            sw.apply({'window_size': (10, 10)})
+
+
+class TestSweep:
+    ''' tests simulating and collecting the metrics'''
+    def test_simulate(self):
+        ''' tests the metrics of a run where particles land'''
+        metrics = sw.simulate({'gravity': -.0001}, 300, seed=1)
+        assert 0 < metrics['max_height'] < 1
+        assert metrics['landings'] > 0
+        assert metrics['landing_histogram'].sum() == metrics['landings']
+        assert metrics['particle_seconds'] > 0
+        assert sw.simulate({'gravity': -.0001}, 300, seed=1)['max_height'] \
+            == metrics['max_height']
+
+
+    def test_run_sweep(self, tmp_path):
+        ''' tests the columns of a parallel sweep and the results file'''
+        configurations = sw.grid(gravity=[-.0001, -.0002], angle_spread=[2])
+        columns = sw.run_sweep(configurations, 200, workers=2)
+        assert list(columns['gravity_y']) == [-.0001, -.0002]
+        assert list(columns['seed']) == [0, 1]
+        assert columns['landing_histogram'].shape == (2, sw.LANDING_BINS)
+        # the stronger gravity pulls the particles down earlier:
+        assert columns['max_height'][0] > columns['max_height'][1]
+        path = tmp_path / 'results.npz'
+        sw.save_results(path, columns)
+        with np.load(path) as results:
+            assert set(results.files) == set(columns)
@@ -0,0 +1,66 @@
+''' tests the terrain height lookup '''
+
+import numpy as np
+import pytest
+import games.volcano_sim.terrain as t
+import games.volcano_sim.settings as s
+
+
+class TestTerrain:
+    ''' tests the class Terrain'''
+    @pytest.fixture
+    def settings(self):
+        ''' a coarse flat planet'''
+        settings = s.Settings()
+        settings.terrain_columns = 10
+        return settings
+
+
+    def test_flat_planet(self, settings):
+        ''' tests that the ground is only where the planet is'''
+        heights = t.Terrain.from_settings(settings).heights
+        assert heights[0] == heights[-1] == -np.inf
+        assert list(heights[1:-1]) == [.1] * 8
+
+
+    def test_cone(self, settings):
+        ''' tests the cone rising towards the vent'''
+        settings.terrain_cone = (.2, .25)
+        heights = t.Terrain.from_settings(settings).heights
+        assert heights[4] == heights[5] == pytest.approx(.1 + .2 * .8)
+        assert heights[3] == pytest.approx(.1 + .2 * .4)
+        assert heights[2] == heights[1] == .1
+
+
+    def test_cones_at_vents(self, settings):
+        ''' tests a cone at every vent of a field'''
+        settings.terrain_cone = (.2, .1)
+        settings.vent_positions = [(.25, 0), (.75, 0)]
+        heights = t.Terrain.from_settings(settings).heights
+        assert heights[2] == heights[7] == pytest.approx(.3)
+        assert list(heights[3:7]) == pytest.approx([.1] * 4)
+
+
+    def test_hits(self, settings):
+        ''' tests that only falling particles below the ground hit it'''
+        terrain = t.Terrain.from_settings(settings)
+        x = np.array([.5, .5, .5, .05, 1.])
+        y = np.array([.05, .05, .15, -.5, .05])
+        y_velocity = np.array([-1., 1., -1., -1., -1.])
+        assert terrain.hits(x, y, y_velocity).tolist() == [
+            True, False, False, False, False
+        ]
+
+
+    def test_deposit(self, settings):
+        ''' tests that deposits pile up per column'''
+        terrain = t.Terrain.from_settings(settings)
+        terrain.deposit(np.array([.51, .55, .31]), .01)
+        assert terrain.height_at(np.array([.5, .3, .7])).tolist() \
+            == pytest.approx([.12, .11, .1])
+
+
+    def test_invalid(self):
+        ''' tests that the heights must be a 1D array'''
+        with pytest.raises(ValueError):
+            t.Terrain([])
@@ -0,0 +1,55 @@
+''' tests the batched start velocities '''
+
+import numpy as np
+import pytest
+import games.volcano_sim.velocity_distributions as vd
+
+
+class TestVelocityDistributions:
+    ''' tests the distributions and the sampling of velocities'''
+    @pytest.mark.parametrize('name', list(vd.DISTRIBUTIONS))
+    def test_spread(self, name):
+        ''' tests mean and spread of the deviations'''
+        deviations = vd.get_distribution(name)(
+            np.random.default_rng(0), 2., 10_000
+        )
+        assert deviations.shape == (10_000,)
+        assert deviations.mean() == pytest.approx(0, abs=.1)
+        if name != 'normal':
+            assert np.abs(deviations).max() <= 2
+
+
+    def test_unknown_distribution(self):
+        ''' tests that unknown names are rejected'''
+        with pytest.raises(ValueError):
+            vd.get_distribution('cauchy')
+
+
+    def test_sample_velocities(self):
+        ''' tests speeds and angles of a sampled batch'''
+        x_velocity, y_velocity = vd.sample_velocities(
+            np.random.default_rng(0), 1_000, 1., .1, 30
+        )
+        speeds = np.hypot(x_velocity, y_velocity)
+        angles = np.degrees(np.arctan2(x_velocity, y_velocity))
+        assert speeds.min() >= .9 and speeds.max() <= 1.1
+        assert angles.min() >= -30 and angles.max() <= 30
+        assert (y_velocity >= 0).all()
+
+
+    def test_seeded(self):
+        ''' tests that equal seeds give equal batches'''
+        first, second = (
+            vd.sample_velocities(np.random.default_rng(3), 10, 1., .1, 5)
+            for _ in range(2)
+        )
+        assert np.array_equal(first, second)
+
+
+    def test_no_spread(self):
+        ''' tests that without spread all particles fly straight up'''
+        x_velocity, y_velocity = vd.sample_velocities(
+            np.random.default_rng(0), 3, 1., 0, 0, vd.truncated_normal
+        )
+        assert list(x_velocity) == [0, 0, 0]
+        assert list(y_velocity) == [1, 1, 1]
@@ -1,9 +1,13 @@
 ''' test the functions inside the volcano class '''
 
+import tracemalloc
+import numpy as np
 import pytest
-import games.volcano as v
-import games.settings as s
-import games.particle as p
+import games.volcano_sim.volcano as v
+import games.volcano_sim.settings as s
+import games.volcano_sim.particle as p
+import games.volcano_sim.eruption_scheduler as es
+import games.volcano_sim.heatmap as hm
 
 class TestVolcano:
     ''' class to test the methods in the Volcano class'''
@@ -16,4 +20,466 @@ class TestVolcano:
     def test_erupt(self, volcano):
         '''tests the erupt function'''
         volc = volcano
-        volc.
\ No newline at end of file
+        duration = s.Settings().eruption_time
+        for _ in range(duration):
+            volc.erupt()
+            volc.step()
+        assert len(volc.store) == duration * volc.concurrent_expulsions
+        for _ in range(s.Settings().eruption_downtime):
+            volc.erupt()
+            volc.step()
+        assert len(volc.store) == duration * volc.concurrent_expulsions
+        volc.erupt()
+        assert len(volc.store) == (duration + 1) * volc.concurrent_expulsions
+
+
+    def test_erupt_in_bulk(self):
+        ''' tests that overlapping profiles expel in one batch'''
+        settings = s.Settings()
+        settings.concurrent_expulsions = 3
+        volcano = v.Volcano(settings, p.Particle(settings), [
+            es.PeriodicEruption(1, 9, expulsions=2),
+            es.PeriodicEruption(5, 5),
+        ])
+        volcano.erupt()
+        assert len(volcano.store) == (2 + 1) * 3
+
+
+    def test_single_expulsion_in_bulk(self):
+        ''' tests that one expulsion draws a whole seeded batch'''
+        settings = s.Settings()
+        batches = [
+            v.Volcano(
+                settings, p.Particle(settings), rng=np.random.default_rng(5)
+            ) for _ in range(2)
+        ]
+        for volcano in batches:
+            assert volcano.single_expulsion(500) == 500
+        first, second = (volcano.store for volcano in batches)
+        assert np.array_equal(first.vx, second.vx)
+        assert len(set(first.vx)) == 500
+        assert (first.vy > 0).all()
+
+
+    def test_max_particles_only(self):
+        ''' tests capping the pool below the default particle_capacity'''
+        settings = s.Settings()
+        settings.max_particles = 1000
+        volcano = v.Volcano(settings, p.Particle(settings))
+        assert volcano.single_expulsion(1500) == 1000
+        assert volcano.store.capacity == 1000
+
+
+    def test_particles_are_views(self, volcano):
+        ''' tests that the particles property reflects the store'''
+        volc = volcano
+        volc.single_expulsion()
+        views = volc.particles
+        assert len(views) == volc.concurrent_expulsions
+        volc.store.x[0] = .25
+        volc.store.y[0] = .75
+        volc.update_pixel_centers()
+        assert views[0].position == (.25, .75)
+        assert views[0].image is volc._default_particle.image
+        assert views[0].box.center == volc.convert_internals_to_px((.25, .75))
+
+
+    def test_set_particles(self, volcano):
+        ''' tests that a list of particles is copied into the store'''
+        volc = volcano
+        particle = p.Particle(s.Settings())
+        particle.position = (.1, .2)
+        particle.velocity = (.3, .4)
+        volc.particles = [particle, particle]
+        assert len(volc.store) == 2
+        assert volc.particles[1].position == (.1, .2)
+        assert volc.particles[1].velocity == (.3, .4)
+        with pytest.raises(ValueError):
+            volc.particles = (particle,)
+
+
+    def test_updates(self, volcano):
+        ''' tests the velocity and position updates of all particles'''
+        volc = volcano
+        volc.store.spawn([.5, .2], [0, .1], [0, .1], [.5, .1])
+        volc._gravity = (0, -.1)
+        volc.update_particle_velocities()
+        assert list(volc.store.vy) == pytest.approx([.4, 0])
+        volc.update_particle_positions()
+        assert list(volc.store.x) == pytest.approx([.5, .3])
+        assert list(volc.store.y) == pytest.approx([.4, .1])
+        assert list(volc.store.age) == [1, 1]
+        assert [particle.box.center for particle in volc.particles] == [
+            volc.convert_internals_to_px((.5, .4)),
+            volc.convert_internals_to_px((.3, .1)),
+        ]
+
+
+    def test_step(self, volcano):
+        ''' tests that a step moves the particles and their pixel centers'''
+        volc = volcano
+        volc.store.spawn([.5, .2], [0, .1], [0, .1], [.5, .1])
+        volc._gravity = (0, -.1)
+        volc.step()
+        assert list(volc.store.x) == pytest.approx([.5, .3])
+        assert list(volc.store.y) == pytest.approx([.4, .1])
+        for index, view in enumerate(volc.particles):
+            assert view.box.center == volc.convert_internals_to_px(
+                (volc.store.x[index], volc.store.y[index])
+            )
+
+
+    def test_destroy_out_of_bounds(self, volcano):
+        ''' tests that all particles outside the window are removed'''
+        volc = volcano
+        volc.store.spawn(
+            [.5, -.1, 1.1, .5, .5, .2], [.5, .5, .5, -.1, -.2, .3], 0, 0
+        )
+        volc.destroy_out_of_bounds()
+        assert sorted(volc.store.x) == [.2, .5]
+        assert sorted(volc.store.y) == [.3, .5]
+
+
+class TestCollision:
+    ''' tests the responses to particles hitting the ground'''
+    def volcano(self, collision):
+        ''' returns a volcano with one falling particle per column type'''
+        settings = s.Settings()
+        settings.collision = collision
+        volcano = v.Volcano(settings, p.Particle(settings))
+        volcano.store.spawn([.5, .5, .05], [.09, .09, .09], 0,
+                            [-.01, -1e-7, -.01])
+        return volcano
+
+
+    @pytest.mark.parametrize('collision', ['stop', 'deposit'])
+    def test_absorbed(self, collision):
+        ''' tests that particles on the planet are removed and recorded'''
+        volcano = self.volcano(collision)
+        volcano.heatmap = hm.HeatmapAccumulator()
+        volcano.destroy_out_of_bounds()
+        assert volcano.store.x.tolist() == [.05]
+        assert volcano.heatmap.landing_x.tolist() == [.5, .5]
+        height = volcano.terrain.height_at(np.array([.5]))[0]
+        if collision == 'deposit':
+            assert height == pytest.approx(.1 + 2 * .0005)
+        else:
+            assert height == .1
+
+
+    @pytest.mark.parametrize('collision', ['stop', 'deposit'])
+    def test_below_window(self, collision):
+        ''' tests that a particle hitting the planet below the window is
+            recorded once
+        '''
+        settings = s.Settings()
+        settings.collision = collision
+        volcano = v.Volcano(settings, p.Particle(settings))
+        volcano.heatmap = hm.HeatmapAccumulator()
+        volcano.store.spawn(.5, -.01, 0, -.2)
+        volcano.destroy_out_of_bounds()
+        assert len(volcano.store) == 0
+        assert volcano.heatmap.landing_x.tolist() == [.5]
+
+
+    def test_bounce(self):
+        ''' tests that fast particles bounce, slow ones settle'''
+        volcano = self.volcano('bounce')
+        volcano.destroy_out_of_bounds()
+        assert volcano.store.y.tolist() == [.1, .09]
+        assert volcano.store.vy.tolist() == [.005, -.01]
+        assert volcano.store.py[0] == volcano.convert_y_to_px(.1)
+
+
+    def test_invalid(self):
+        ''' tests unknown responses and the analytic volcano'''
+        settings = s.Settings()
+        settings.collision = 'explode'
+        with pytest.raises(ValueError):
+            v.Volcano(settings, p.Particle(settings))
+        settings.collision = 'stop'
+        with pytest.raises(ValueError):
+            v.AnalyticVolcano(settings, p.Particle(settings))
+
+
+class TestInteractions:
+    ''' tests the forces between close particles'''
+    def volcano(self, strength):
+        ''' returns a weightless volcano with two close particles and a
+            far one
+        '''
+        settings = s.Settings()
+        settings.gravity = (0, 0)
+        settings.interaction_radius = .05
+        settings.interaction_strength = strength
+        volcano = v.Volcano(settings, p.Particle(settings))
+        volcano.store.spawn([.5, .52, .9], [.5, .5, .5], 0, 0)
+        return volcano
+
+
+    def test_repulsion(self):
+        ''' tests that positive strengths push close particles apart'''
+        volcano = self.volcano(1e-3)
+        volcano.step()
+        x_velocity = volcano.store.vx
+        assert x_velocity[0] < 0 < x_velocity[1]
+        assert x_velocity[0] == pytest.approx(-x_velocity[1])
+        assert x_velocity[2] == 0
+        assert list(volcano.store.vy) == [0, 0, 0]
+
+
+    def test_agglomeration(self):
+        ''' tests that negative strengths pull close particles together'''
+        volcano = self.volcano(-1e-3)
+        volcano.step()
+        assert volcano.store.vx[0] > 0 > volcano.store.vx[1]
+
+
+    def test_grid(self):
+        ''' tests that the grid is only there with interactions'''
+        assert v.Volcano(s.Settings(), p.Particle(s.Settings())).grid is None
+        volcano = self.volcano(1e-3)
+        volcano.step()
+        assert len(volcano.grid) == 3
+
+
+class TestAnalyticVolcano:
+    ''' compares the AnalyticVolcano with the integrating Volcano'''
+    def run(self, volcano_class, ticks):
+        ''' runs a volcano like Game.main_loop does, returns the counts'''
+        settings = s.Settings()
+        settings.gravity = (0, -.0001)
+        volcano = volcano_class(
+            settings, p.Particle(settings), rng=np.random.default_rng(1)
+        )
+        counts = []
+        for _ in range(ticks):
+            volcano.destroy_out_of_bounds()
+            volcano.erupt()
+            volcano.step()
+            counts.append(len(volcano.store))
+        return volcano, counts
+
+
+    def test_same_trajectories(self):
+        ''' tests that both volcanoes produce the same particles'''
+        volcano, counts = self.run(v.Volcano, 300)
+        analytic, analytic_counts = self.run(v.AnalyticVolcano, 300)
+        assert analytic_counts == counts
+        assert max(counts) > 0
+        assert list(analytic.store.x) == pytest.approx(list(volcano.store.x))
+        assert list(analytic.store.y) == pytest.approx(list(volcano.store.y))
+        assert list(analytic.store.vy) \
+            == pytest.approx(list(volcano.store.vy))
+        assert list(analytic.store.px) == list(volcano.store.px)
+        assert list(analytic.store.age) == list(volcano.store.age)
+
+
+    def test_seek(self):
+        ''' tests that seeking forward moves and culls the particles'''
+        analytic, _ = self.run(v.AnalyticVolcano, 10)
+        assert len(analytic.store) == 10
+        analytic.seek(analytic.tick + 5)
+        assert list(analytic.store.age) == list(range(15, 5, -1))
+        analytic.seek(10_000)
+        analytic.destroy_out_of_bounds()
+        assert len(analytic.store) == 0
+        with pytest.raises(ValueError):
+            analytic.seek(0)
+
+
+    @pytest.mark.parametrize('field, value', [
+        ('integrator', 'verlet'), ('integrator', 'rk4'), ('substeps', 2)
+    ])
+    def test_unsupported_integration(self, field, value):
+        ''' tests that settings the closed form can't follow are rejected'''
+        settings = s.Settings()
+        setattr(settings, field, value)
+        with pytest.raises(ValueError):
+            v.AnalyticVolcano(settings, p.Particle(settings))
+
+
+    def test_set_particles(self):
+        ''' tests that replaced particles don't confuse the exit queue'''
+        analytic, _ = self.run(v.AnalyticVolcano, 10)
+        particle = p.Particle(s.Settings())
+        particle.velocity = (0, 0)
+        analytic.particles = [particle]
+        analytic.seek(10_000)
+        analytic.destroy_out_of_bounds()
+        assert len(analytic.store) == 0
+
+
+class TestVolcanicField:
+    ''' tests several vents sharing one store'''
+    POSITIONS = [(.2, 0), (.5, 0), (.8, 0)]
+
+    @pytest.fixture
+    def field(self):
+        ''' a seeded field of three vents'''
+        settings = s.Settings()
+        settings.seed = 3
+        return v.VolcanicField.from_positions(
+            settings, self.POSITIONS, ['red', 'blue', 'yellow']
+        )
+
+
+    def test_erupt(self, field):
+        ''' tests that every vent spawns at its own position'''
+        field.erupt()
+        assert len(field.store) == 3
+        vents = field.template_indices()
+        assert sorted(vents.tolist()) == [0, 1, 2]
+        assert list(field.store.x) == [
+            self.POSITIONS[vent][0] for vent in vents
+        ]
+        assert [particle.image for particle in field.particles] == [
+            field.templates[vent].image for vent in vents
+        ]
+
+
+    def test_own_schedules(self):
+        ''' tests that each vent erupts on its own profiles'''
+        settings = s.Settings()
+        vents = []
+        for position, profile in zip(self.POSITIONS, (
+            es.PeriodicEruption(1, 1), es.PeriodicEruption(1, 3),
+            es.PeriodicEruption(1, 0, expulsions=2, start=5),
+        )):
+            particle = p.Particle(settings)
+            particle.position = position
+            vents.append(v.Volcano(settings, particle, [profile]))
+        field = v.VolcanicField(settings, vents)
+        for _ in range(8):
+            field.erupt()
+            field.step()
+        assert np.bincount(field.store.column('vent')).tolist() == [4, 2, 6]
+
+
+    def test_culling_keeps_vents(self, field):
+        ''' tests that the vent column follows its particles'''
+        field.advance(200)
+        vents = field.template_indices()
+        assert len(vents) == len(field.store)
+        centers = np.array(self.POSITIONS)[vents, 0]
+        assert np.all(np.abs(field.store.x - centers) < .2)
+
+
+    def test_full_store(self):
+        ''' tests that dropped particles don't shift the vents'''
+        settings = s.Settings()
+        settings.particle_capacity = settings.max_particles = 4
+        field = v.VolcanicField.from_positions(settings, self.POSITIONS)
+        assert field.expel([2, 0, 3]) == 4
+        assert field.template_indices().tolist() == [0, 0, 2, 2]
+
+
+    def allocated(self, vents):
+        ''' returns the bytes held by a field of vents with collisions and
+            interactions, checks that the vents only hold what they use
+        '''
+        settings = s.Settings()
+        settings.collision = 'stop'
+        settings.interaction_radius = .05
+        tracemalloc.start()
+        field = v.VolcanicField.from_positions(
+            settings, [(.1 + .8 * i / vents, 0) for i in range(vents)]
+        )
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert all(
+            vent.store.capacity == 1 and vent.terrain is None
+            and vent.grid is None for vent in field.vents
+        )
+        assert field.terrain is not None and field.grid is not None
+        return size
+
+
+    def test_memory(self):
+        ''' tests that the vents share the store, terrain and grid of the
+            field instead of each allocating their own
+        '''
+        assert self.allocated(20) < 2 * self.allocated(1)
+
+
+    def test_invalid(self, field):
+        ''' tests the validation of vents and numbers'''
+        with pytest.raises(ValueError):
+            v.VolcanicField(s.Settings(), [])
+        with pytest.raises(ValueError):
+            field.expel([1, 2])
+        with pytest.raises(ValueError):
+            v.VolcanicField.from_positions(
+                s.Settings(), self.POSITIONS, ['red']
+            )
+        settings = s.Settings()
+        settings.analytic_trajectories = True
+        with pytest.raises(ValueError):
+            v.VolcanicField.from_positions(settings, self.POSITIONS)
+
+
+class TestFastForward:
+    ''' tests advancing the volcanoes without rendering'''
+    def state(self, volcano):
+        ''' returns everything advancing has to get right'''
+        return (
+            volcano.tick, volcano.scheduler.next_tick, len(volcano.store)
+        )
+
+
+    def ticked(self, volcano, ticks):
+        ''' runs ticks one by one like the main loop'''
+        for _ in range(ticks):
+            volcano.destroy_out_of_bounds()
+            volcano.erupt()
+            volcano.step()
+
+
+    @pytest.mark.parametrize('volcano_class', [v.Volcano, v.AnalyticVolcano])
+    @pytest.mark.parametrize('ticks', [1, 19, 20, 21, 60, 80, 81, 500])
+    def test_advance(self, volcano_class, ticks):
+        ''' tests that advancing equals ticking one by one'''
+        settings = s.Settings()
+        settings.gravity = (0, -.001)
+        settings.randomness = False
+        expected = volcano_class(settings, p.Particle(settings))
+        self.ticked(expected, ticks)
+        volcano = volcano_class(settings, p.Particle(settings))
+        assert volcano.advance(ticks) == ticks
+        assert self.state(volcano) == self.state(expected)
+        assert list(volcano.store.y) == pytest.approx(list(expected.store.y))
+
+
+    def test_skip_idle(self):
+        ''' tests that an empty volcano skips its downtime at once'''
+        volcano = v.Volcano(
+            s.Settings(), p.Particle(s.Settings()),
+            [es.PeriodicEruption(1, 100)]
+        )
+        volcano.advance(1)
+        volcano.store.clear()
+        calls = []
+        volcano.step = lambda: calls.append(1)
+        volcano.advance(100)
+        assert not calls
+        assert volcano.tick == volcano.scheduler.next_tick == 101
+
+
+    def test_skip_to_next_eruption(self):
+        ''' tests that skipping lands on the start of the next eruption'''
+        settings = s.Settings()
+        settings.gravity = (0, -.001)
+        volcano = v.AnalyticVolcano(settings, p.Particle(settings))
+        volcano.advance(5)
+        ticks = volcano.skip_to_next_eruption()
+        assert volcano.tick == 5 + ticks == 80
+        before = len(volcano.store)
+        volcano.erupt()
+        assert len(volcano.store) == before + 1
+
+
+    def test_advance_seconds(self):
+        ''' tests the conversion of seconds to ticks'''
+        volcano = v.Volcano(s.Settings(), p.Particle(s.Settings()))
+        assert volcano.advance_seconds(2) == 2 * s.Settings().physics_hz
+        assert volcano.tick == 120